@@ -17,25 +17,39 @@ from app.services.analytics_service import AnalyticsService
 
 # Singleton instances - cached for reuse across requests
 @lru_cache()
-def get_blockchain_service() -> BlockchainService:
-    """Get blockchain service instance"""
+def _blockchain_service() -> BlockchainService:
     return BlockchainService()
 
 
 @lru_cache()
-def get_ai_service() -> AIService:
-    """Get AI service instance (uses default Gemini LLM)"""
+def _ai_service() -> AIService:
     return AIService()
 
 
 @lru_cache()
-def get_analytics_service() -> AnalyticsService:
-    """Get analytics service instance"""
+def _analytics_service() -> AnalyticsService:
     return AnalyticsService()
 
 
+# Providers are async so FastAPI awaits them inline instead of dispatching each one
+# to the threadpool on every request
+async def get_blockchain_service() -> BlockchainService:
+    """Get blockchain service instance"""
+    return _blockchain_service()
+
+
+async def get_ai_service() -> AIService:
+    """Get AI service instance (uses default Gemini LLM)"""
+    return _ai_service()
+
+
+async def get_analytics_service() -> AnalyticsService:
+    """Get analytics service instance"""
+    return _analytics_service()
+
+
 # Services that depend on other services
-def get_chat_service(
+async def get_chat_service(
     ai_service: Annotated[AIService, Depends(get_ai_service)],
     blockchain_service: Annotated[BlockchainService, Depends(get_blockchain_service)],
 ) -> ChatService:
@@ -43,14 +57,14 @@ def get_chat_service(
     return ChatService(ai_service, blockchain_service)
 
 
-def get_intent_service(
+async def get_intent_service(
     blockchain_service: Annotated[BlockchainService, Depends(get_blockchain_service)],
 ) -> IntentService:
     """Get intent service instance"""
     return IntentService(blockchain_service)
 
 
-def get_execution_service(
+async def get_execution_service(
     blockchain_service: Annotated[BlockchainService, Depends(get_blockchain_service)],
 ) -> ExecutionService:
     """Get execution service instance"""
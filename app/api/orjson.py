@@ -0,0 +1,35 @@
+"""
+Pre-serialized JSON responses
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> str:
+    """Encode types orjson doesn't handle natively"""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + value.hex()
+    return str(value)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight from python objects by orjson
+
+    This is the app-wide default response class. Handlers can also return it with
+    response_model=None so FastAPI skips jsonable_encoder and response_model
+    re-validation. Datetimes are encoded natively, bytes (e.g. decoded event args) become
+    0x-hex, and anything else orjson doesn't know (e.g. Decimal, UUID) falls back to str.
+    Subclasses JSONResponse so FastAPI still documents response models in the OpenAPI
+    schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -2,33 +2,61 @@
 Agent management endpoints
 """
 
+import asyncio
+import hashlib
 from typing import Annotated, List, Optional, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
+from loguru import logger
+from web3 import Web3
 
 from app.api.dependencies import get_blockchain_service
-from app.models.schemas import AgentResponse, AgentListResponse
-from app.services.blockchain_service import BlockchainService
+from app.api.orjson import ORJSONResponse
+from app.models.schemas import AgentResponse, AgentListResponse, TxHash, to_bytes32
+from app.services.blockchain_service import BlockchainService, invalidate_agent_cache
 from app.blockchain.client import blockchain_client
 from app.config import settings
-from app.db.session import get_db_connection
+from app.db.session import get_db_connection, run_db
 from app.db.models import AgentCacheModel, AgentFunctionAuthorizationModel
 
 router = APIRouter()
 
+_AGENT_REGISTERED_TOPIC = Web3.keccak(text="AgentRegistered(bytes32,address,address,string)")
+_LIST_CACHE_CONTROL = "max-age=30"
+
+
+def _agent_list_etag(body: bytes) -> str:
+    """ETag for a serialized agent list page; always describes the body actually sent"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
 
 @router.get("", response_model=AgentListResponse)
 async def list_agents(
     skip: int = 0,
     limit: int = 100,
     owner: Optional[str] = None,
+    request: Request = None,
     blockchain: Annotated[BlockchainService, Depends(get_blockchain_service)] = None,
 ):
     """List all registered agents, optionally filtered by owner address"""
     try:
+        # Pages come from the in-process agent list cache, so hashing the rendered page is
+        # cheap and the tag can never pair a new version with a stale body
         agents = await blockchain.get_all_agents(skip=skip, limit=limit, owner=owner)
-        return AgentListResponse(agents=agents, total=len(agents))
+        page = ORJSONResponse(
+            content=AgentListResponse(agents=agents, total=len(agents)).model_dump(
+                mode="json", by_alias=True
+            )
+        )
+        etag = _agent_list_etag(page.body)
+        headers = {"ETag": etag, "Cache-Control": _LIST_CACHE_CONTROL}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        page.headers.update(headers)
+        return page
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -71,7 +99,8 @@ async def register_agent(
     """
     try:
         # Ensure blockchain client is initialized and contracts loaded
-        await blockchain.client.initialize()
+        if not blockchain.client.initialized:
+            await blockchain.client.initialize()
 
         try:
             registry = blockchain.client.get_contract("AgentRegistry")
@@ -80,6 +109,17 @@ async def register_agent(
                 status_code=500, detail=f"AgentRegistry ABI or address not loaded: {e}"
             )
 
+        # Fetch nonce and gas price concurrently (independent RPC round-trips)
+        nonce, gas_price = await asyncio.gather(
+            blockchain.client.get_transaction_count(request.ownerAddress),
+            blockchain.client.get_gas_price(),
+            return_exceptions=True,
+        )
+        if isinstance(nonce, Exception):
+            raise nonce
+        if isinstance(gas_price, Exception):
+            gas_price = None
+
         # Build transaction
         tx = await registry.functions.registerAgent(
             request.targetContract,
@@ -91,21 +131,16 @@ async def register_agent(
                 "value": 0,
                 "gas": 0,
                 "gasPrice": 0,
-                "nonce": await blockchain.client.get_transaction_count(request.ownerAddress),
+                "nonce": nonce,
             }
         )
 
-        # Estimate gas and gas price
+        # Estimate gas
         try:
             gas_estimate = await blockchain.client.estimate_gas(tx)
         except Exception:
             gas_estimate = 500000
 
-        try:
-            gas_price = await blockchain.client.get_gas_price()
-        except Exception:
-            gas_price = None
-
         transaction = {
             "to": settings.AGENT_REGISTRY_ADDRESS,
             "data": tx.get("data"),
@@ -119,6 +154,9 @@ async def register_agent(
             ],
         }
 
+        if gas_price is not None:
+            transaction["gasPrice"] = str(gas_price)
+
         return {
             "success": True,
             "requiresTransaction": True,
@@ -134,7 +172,7 @@ async def register_agent(
 class ConfirmAgentRegistrationRequest(BaseModel):
     """Confirm registration by parsing the transaction receipt for AgentRegistered."""
 
-    txHash: str
+    txHash: TxHash
     abi: Optional[List[Dict[str, Any]]] = None  # Optional ABI for the target contract
 
 
@@ -147,7 +185,8 @@ async def confirm_agent_registration(
     Parse AgentRegistered event from the tx receipt and return agentId and agent details.
     """
     try:
-        await blockchain.client.initialize()
+        if not blockchain.client.initialized:
+            await blockchain.client.initialize()
 
         registry = blockchain.client.get_contract("AgentRegistry")
 
@@ -159,32 +198,33 @@ async def confirm_agent_registration(
                 "txHash": request.txHash,
             }
 
-        agent_id_hex = None
-        # Parse logs for AgentRegistered
+        agent_id_bytes = None
+        # Parse logs for AgentRegistered; only the matching log is ABI-decoded
         for log in receipt.get("logs", []):
+            topics = log.get("topics")
+            if not topics or topics[0] != _AGENT_REGISTERED_TOPIC:
+                continue
             try:
                 ev = registry.events.AgentRegistered().process_log(log)
-                agent_id_bytes = ev["args"]["agentId"] if "agentId" in ev["args"] else ev["args"][0]
-                if isinstance(agent_id_bytes, (bytes, bytearray)):
-                    agent_id_hex = "0x" + agent_id_bytes.hex()
-                else:
-                    # web3.py may return HexBytes
-                    agent_id_hex = str(agent_id_bytes)
+                agent_id_bytes = to_bytes32(
+                    ev["args"]["agentId"] if "agentId" in ev["args"] else ev["args"][0]
+                )
                 break
             except Exception:
                 continue
 
-        if not agent_id_hex:
+        if not agent_id_bytes:
             return {
                 "success": False,
                 "error": "AgentRegistered event not found",
                 "txHash": request.txHash,
             }
 
+        # Normalize once: bytes32 for the contract call, 0x-hex for responses and storage
+        agent_id_hex = "0x" + agent_id_bytes.hex()
+
         # Fetch agent details
         try:
-            # Convert hex to bytes32 for the contract call
-            agent_id_bytes = bytes.fromhex(agent_id_hex[2:])
             agent_tuple = await registry.functions.getAgent(agent_id_bytes).call()
 
             owner = agent_tuple[0]
@@ -200,29 +240,29 @@ async def confirm_agent_registration(
                 "name": name,
                 "active": bool(active),
             }
+            invalidate_agent_cache(agent_id_hex)
 
             # Save to database
             try:
-                with get_db_connection() as conn:
-                    AgentCacheModel.upsert(
-                        conn,
-                        {
-                            "agent_id": agent_id_hex,
-                            "target_address": target,
-                            "owner": owner,
-                            "name": name,
-                            "description": "",
-                            "config_ipfs": config_ipfs,
-                            "active": bool(active),
-                            "abi": request.abi if request.abi else None,
-                        },
-                    )
+                await run_db(
+                    AgentCacheModel.upsert,
+                    {
+                        "agent_id": agent_id_hex,
+                        "target_address": target,
+                        "owner": owner,
+                        "name": name,
+                        "description": "",
+                        "config_ipfs": config_ipfs,
+                        "active": bool(active),
+                        "abi": request.abi if request.abi else None,
+                    },
+                )
             except Exception as db_error:
                 # Log but don't fail - agent is already on blockchain
-                print(f"Warning: Failed to cache agent in database: {db_error}")
+                logger.warning(f"Failed to cache agent in database: {db_error}")
 
         except Exception as e:
-            print(f"Error fetching agent details: {e}")
+            logger.exception(f"Error fetching agent details: {e}")
             agent_obj = None
 
         return {
@@ -266,8 +306,10 @@ async def authorize_functions(
 ):
     """Authorize functions for an agent"""
     try:
-        with get_db_connection() as conn:
-            AgentFunctionAuthorizationModel.authorize_functions(conn, agent_id, request.functions)
+        await run_db(
+            AgentFunctionAuthorizationModel.authorize_functions, agent_id, request.functions
+        )
+        invalidate_agent_cache(agent_id)
 
         return {"success": True, "message": f"Authorized {len(request.functions)} function(s)"}
     except Exception as e:
@@ -282,8 +324,8 @@ async def revoke_functions(
 ):
     """Revoke functions for an agent"""
     try:
-        with get_db_connection() as conn:
-            AgentFunctionAuthorizationModel.revoke_functions(conn, agent_id, request.functions)
+        await run_db(AgentFunctionAuthorizationModel.revoke_functions, agent_id, request.functions)
+        invalidate_agent_cache(agent_id)
 
         return {"success": True, "message": f"Revoked {len(request.functions)} function(s)"}
     except Exception as e:
@@ -345,6 +387,7 @@ async def update_agent(
             cursor.execute(query, params)
             conn.commit()
             cursor.close()
+        invalidate_agent_cache(agent_id)
 
         # Get updated agent
         updated_agent = await blockchain.get_agent(agent_id)
@@ -382,6 +425,7 @@ async def toggle_agent_status(
             )
             conn.commit()
             cursor.close()
+        invalidate_agent_cache(agent_id)
 
         status_text = "activated" if request.active else "deactivated"
         return {"success": True, "message": f"Agent {status_text} successfully"}
@@ -417,6 +461,7 @@ async def delete_agent(
 
             conn.commit()
             cursor.close()
+        invalidate_agent_cache(agent_id)
 
         return {"success": True, "message": "Agent deleted successfully"}
 
@@ -4,6 +4,8 @@ Chat endpoints (REST API alternative to WebSocket)
 
 from typing import Annotated
 import json
+import re
+from itertools import zip_longest
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -16,6 +18,8 @@ from app.services.chat_service import ChatService
 from app.services.intent_service import IntentService
 from app.services.execution_service import ExecutionService
 from app.services.blockchain_service import BlockchainService
+from app.blockchain.client import RPCError
+from app.models.schemas import to_bytes32
 from app.api.dependencies import get_blockchain_service
 from app.config import settings
 from app.llm.factory import LLMFactory
@@ -25,6 +29,70 @@ from app.db.models import ChatMessageModel
 
 router = APIRouter()
 
+# Intent actions that need a signed transaction; anything else is served as a read
+_WRITE_ACTIONS: frozenset[str] = frozenset({"stake", "withdraw", "claim", "swap", "lend", "borrow"})
+
+# Read-only functions reachable through hub.queryTarget:
+# key -> (signature, arg types, output types, response data keys)
+_READ_FNS = {
+    "balance": ("balanceOf(address)", ["address"], ["uint256"], ["balance"]),
+    "rewards": ("pendingRewards(address)", ["address"], ["uint256"], ["rewards"]),
+    "apy": ("getCurrentAPY()", [], ["uint256"], ["apy"]),
+    "tvl": ("getTVL()", [], ["uint256"], ["tvl"]),
+    "stakeinfo": (
+        "getStakeInfo(address)",
+        ["address"],
+        ["uint256", "uint256", "uint256", "uint256"],
+        ["stakedAmount", "rewards", "stakingDuration", "apy"],
+    ),
+}
+
+# 4-byte selectors computed once instead of hashing per request
+_SELECTORS = {sig: Web3.keccak(text=sig)[:4] for sig, _, _, _ in _READ_FNS.values()}
+_SELECTORS.update({sig: Web3.keccak(text=sig)[:4] for sig in ("totalSupply()", "decimals()")})
+
+# Parsed intent actions that name a read function directly
+_READ_ACTIONS = {
+    "balance": "balance",
+    "balanceof": "balance",
+    "pendingrewards": "rewards",
+    "getcurrentapy": "apy",
+    "apy": "apy",
+    "gettvl": "tvl",
+    "tvl": "tvl",
+    "getstakeinfo": "stakeinfo",
+}
+
+# Single compiled scan for read keywords in the user's message
+_READ_RE = re.compile(r"\b(balance|pending|rewards|apy|tvl|stake\s?info)", re.IGNORECASE)
+
+
+def _encode_address(address: str) -> bytes:
+    """ABI-encode a lone address argument (left-padded 32-byte word) without eth_abi"""
+    if len(address) != 42 or not address.startswith("0x"):
+        raise ValueError(f"Invalid address: {address}")
+    return bytes.fromhex(address[2:]).rjust(32, b"\x00")
+
+
+def _decode_uint256_tuple(raw: bytes, n: int) -> tuple[int, ...]:
+    """Decode n static uint256 return words straight from the big-endian bytes"""
+    if len(raw) < 32 * n:
+        raise ValueError(f"Expected {32 * n} bytes of return data, got {len(raw)}")
+    return tuple(int.from_bytes(raw[i * 32 : (i + 1) * 32], "big") for i in range(n))
+
+
+def _select_read_fn(message: str, action_lower: str) -> str | None:
+    """Pick the _READ_FNS key from the parsed action, else the first keyword in the message"""
+    key = _READ_ACTIONS.get(action_lower)
+    if key:
+        return key
+
+    match = _READ_RE.search(message)
+    if not match:
+        return None
+    word = "".join(match.group(1).lower().split())
+    return "rewards" if word == "pending" else word
+
 
 class ChatRequest(BaseModel):
     """Chat request model"""
@@ -111,29 +179,24 @@ async def process_message_doc_shape(
     - Path: /api/v1/chat/{agent_id}/message
     - Returns either a query response (no transaction) or a transaction preview
     """
+    try:
+        agent_id_bytes = to_bytes32(agent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid agent id: {e}")
+
     try:
         user_address = request.userAddress
 
         # Ensure client initialized
-        await blockchain.client.initialize()
+        if not blockchain.client.initialized:
+            await blockchain.client.initialize()
 
         # Parse intent
         parsed_intent = await chat_service.parse_message(request.message, user_address)
-
-        # Map to transaction request
-        tx_request = await intent_service.process_intent(parsed_intent, user_address)
-
-        # Prefer the path agent_id (override mock when applicable)
-        try:
-            tx_request.agent_id = agent_id
-        except Exception:
-            pass
+        action_lower = (parsed_intent.action or "").lower()
 
         # Heuristic: determine if it's a write tx or a read query
-        write_actions = {"stake", "withdraw", "claim", "swap", "lend", "borrow"}
-        requires_tx = (parsed_intent.action or "").lower() in write_actions
-
-        if not requires_tx:
+        if action_lower not in _WRITE_ACTIONS:
             # Real on-chain read via hub.queryTarget with minimal ABI encoding/decoding
             # 1) Resolve agent and target
             agent = await blockchain.get_agent(agent_id)
@@ -142,83 +205,36 @@ async def process_message_doc_shape(
             target = agent.target_address
 
             # 2) Detect read function by intent + message keywords
-            msg_lower = (request.message or "").lower()
-            action_lower = (parsed_intent.action or "").lower()
-
-            def selector(sig: str) -> bytes:
-                return Web3.keccak(text=sig)[:4]
-
-            # Prepare function selection
-            fn = None
-            arg_types = []
-            args = []
-            out_types = []
-            data_keys = []
-
-            if "balance" in msg_lower or action_lower in {"balance", "balanceof"}:
-                fn = "balanceOf(address)"
-                arg_types = ["address"]
-                args = [user_address]
-                out_types = ["uint256"]
-                data_keys = ["balance"]
-            elif (
-                "pending" in msg_lower
-                or "rewards" in msg_lower
-                or action_lower in {"pendingrewards"}
-            ):
-                fn = "pendingRewards(address)"
-                arg_types = ["address"]
-                args = [user_address]
-                out_types = ["uint256"]
-                data_keys = ["rewards"]
-            elif "apy" in msg_lower or action_lower in {"getcurrentapy", "apy"}:
-                fn = "getCurrentAPY()"
-                out_types = ["uint256"]
-                data_keys = ["apy"]
-            elif "tvl" in msg_lower or action_lower in {"gettvl", "tvl"}:
-                fn = "getTVL()"
-                out_types = ["uint256"]
-                data_keys = ["tvl"]
-            elif (
-                "stake info" in msg_lower
-                or "stakeinfo" in msg_lower
-                or action_lower in {"getstakeinfo"}
-            ):
-                fn = "getStakeInfo(address)"
-                arg_types = ["address"]
-                args = [user_address]
-                out_types = ["uint256", "uint256", "uint256", "uint256"]
-                data_keys = ["stakedAmount", "rewards", "stakingDuration", "apy"]
-
-            if not fn:
+            read_key = _select_read_fn(request.message or "", action_lower)
+            if not read_key:
                 # Unknown read; return a helpful message
                 human = (
                     f"Interpreted as a query on {parsed_intent.protocol or 'the target'}. "
                     "Specify 'balance', 'rewards', 'APY', 'TVL', or 'stake info'."
                 )
-                return DocChatQueryResponse(
-                    response=human,
-                    requiresTransaction=False,
-                    data=None,
-                ).model_dump()
+                # DocChatQueryResponse shape, built directly to skip a validation pass
+                return {
+                    "success": True,
+                    "response": human,
+                    "requiresTransaction": False,
+                    "data": None,
+                }
+
+            fn, arg_types, out_types, data_keys = _READ_FNS[read_key]
+            args = [user_address] if arg_types else []
 
             # 3) Build calldata
-            sig_no_spaces = fn.replace(" ", "")
-            sel = selector(sig_no_spaces)
+            sel = _SELECTORS[fn]
             encoded_args = b""
-            if arg_types:
+            if arg_types == ["address"]:
+                encoded_args = _encode_address(user_address)
+            elif arg_types:
                 encoded_args = encode(arg_types, args)
             call_data = sel + encoded_args
 
             # 4) Call hub.queryTarget
             hub = blockchain.client.get_contract("ContractMindHubV2")
 
-            # Convert agentId
-            if agent_id.startswith("0x"):
-                agent_id_bytes = bytes.fromhex(agent_id[2:])
-            else:
-                agent_id_bytes = agent_id.encode().ljust(32, b"\x00")[:32]
-
             try:
                 raw = await hub.functions.queryTarget(agent_id_bytes, target, call_data).call(
                     {"from": user_address}
@@ -230,28 +246,41 @@ async def process_message_doc_shape(
             decoded = ()
             if out_types:
                 try:
-                    decoded = decode(out_types, raw)
+                    if all(t == "uint256" for t in out_types):
+                        decoded = _decode_uint256_tuple(raw, len(out_types))
+                    else:
+                        decoded = decode(out_types, raw)
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=f"Decode failed: {e}")
 
-            # 6) Build data dict with stringified ints
-            data = {}
-            if data_keys:
-                for i, key in enumerate(data_keys):
-                    val = decoded[i] if i < len(decoded) else None
-                    # return as decimal strings for safety
-                    data[key] = str(val) if val is not None else None
+            # 6) Build data dict with stringified ints (decimal strings for safety);
+            # keys without a decoded value map to None
+            data = {
+                key: str(val) if val is not None else None
+                for key, val in zip_longest(data_keys, decoded[: len(data_keys)])
+            }
 
             human = (
                 f"Fetched {', '.join(data_keys)} from contract."
                 if data_keys
                 else "Query completed."
             )
-            return DocChatQueryResponse(
-                response=human,
-                requiresTransaction=False,
-                data=data,
-            ).model_dump()
+            # DocChatQueryResponse shape, built directly to skip a validation pass
+            return {
+                "success": True,
+                "response": human,
+                "requiresTransaction": False,
+                "data": data,
+            }
+
+        # Map to transaction request (only write ops need protocol lookup and routing)
+        tx_request = await intent_service.process_intent(parsed_intent, user_address)
+
+        # Prefer the path agent_id (override mock when applicable)
+        try:
+            tx_request.agent_id = agent_id
+        except Exception:
+            pass
 
         # Prepare transaction preview for write ops
         prepared_tx = await execution_service.prepare_transaction(
@@ -274,10 +303,12 @@ async def process_message_doc_shape(
             ],
         }
 
-        return DocChatTxResponse(
-            transaction=tx_obj,
-            requiresTransaction=True,
-        ).model_dump()
+        # DocChatTxResponse shape, built directly to skip a validation pass
+        return {
+            "success": True,
+            "requiresTransaction": True,
+            "transaction": tx_obj,
+        }
 
     except HTTPException:
         raise
@@ -359,7 +390,8 @@ async def report_transaction_result(
     """
     try:
         # Ensure blockchain client is initialized
-        await blockchain.client.initialize()
+        if not blockchain.client.initialized:
+            await blockchain.client.initialize()
 
         # Get transaction receipt
         receipt = await blockchain.client.get_transaction_receipt(request.txHash)
@@ -1169,7 +1201,8 @@ async def _execute_read_query(
     """
     try:
         # Initialize blockchain client
-        await blockchain.client.initialize()
+        if not blockchain.client.initialized:
+            await blockchain.client.initialize()
 
         # Get contract instance (we need to use the target contract, not the registry)
         from app.db.session import get_db_connection
@@ -1188,29 +1221,34 @@ async def _execute_read_query(
         )
 
         # Determine which function to call and with what parameters
-        if function_name == "balanceOf":
-            # Call balanceOf with user's address
-            result = await target_contract.functions.balanceOf(
-                Web3.to_checksum_address(user_address)
-            ).call()
-
-            # Format the result
-            # Try to get decimals for better formatting
-            try:
-                decimals = await target_contract.functions.decimals().call()
-                formatted_balance = result / (10**decimals)
-                return f"Your balance is {formatted_balance:.4f} tokens (raw: {result})"
-            except:
-                return f"Your balance is {result} (raw amount)"
-
-        elif function_name == "totalSupply":
-            result = await target_contract.functions.totalSupply().call()
+        if function_name in ("balanceOf", "totalSupply"):
+            # Fetch the amount and decimals (for formatting) in one batched round-trip
+            if function_name == "balanceOf":
+                call_data = _SELECTORS["balanceOf(address)"] + _encode_address(user_address)
+            else:
+                call_data = _SELECTORS["totalSupply()"]
+            raw_result, raw_decimals = await blockchain.multicall(
+                [
+                    (target_contract.address, call_data),
+                    (target_contract.address, _SELECTORS["decimals()"]),
+                ]
+            )
+            if isinstance(raw_result, RPCError):
+                # Surface the node's error (e.g. a revert) rather than guessing at deployment
+                raise raw_result
+            if not raw_result:
+                raise ValueError(f"{function_name} returned no data, is contract deployed?")
+            (result,) = _decode_uint256_tuple(raw_result, 1)
+
+            label = "Your balance" if function_name == "balanceOf" else "Total supply"
             try:
-                decimals = await target_contract.functions.decimals().call()
-                formatted_supply = result / (10**decimals)
-                return f"Total supply is {formatted_supply:.4f} tokens (raw: {result})"
+                if isinstance(raw_decimals, RPCError):
+                    raise raw_decimals
+                (decimals,) = _decode_uint256_tuple(raw_decimals, 1)
+                formatted = result / (10**decimals)
+                return f"{label} is {formatted:.4f} tokens (raw: {result})"
             except:
-                return f"Total supply is {result} (raw amount)"
+                return f"{label} is {result} (raw amount)"
 
         elif function_name == "decimals":
             result = await target_contract.functions.decimals().call()
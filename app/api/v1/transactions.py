@@ -2,15 +2,23 @@
 Transaction endpoints
 """
 
-from typing import Annotated, Optional
+import asyncio
+import base64
+import binascii
+from datetime import datetime
+from typing import Annotated, AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel, Field
 
 from app.api.dependencies import get_blockchain_service
+from app.api.orjson import ORJSONResponse
 from app.services.blockchain_service import BlockchainService
-from app.models.schemas import TransactionHistoryResponse, TransactionHistoryItem
-from app.db.session import get_db_connection
+from app.models import msg
+from app.models.schemas import BaseResponseModel, TransactionHistoryResponse, TxHash
+from app.db.pool import get_async_pool
 from app.db.models import TransactionModel
 
 router = APIRouter()
@@ -22,7 +30,7 @@ class TransactionStatusRequest(BaseModel):
     tx_hash: str
 
 
-class TransactionStatusResponse(BaseModel):
+class TransactionStatusResponse(BaseResponseModel):
     """Transaction status response"""
 
     tx_hash: str
@@ -32,7 +40,52 @@ class TransactionStatusResponse(BaseModel):
     events: list[dict] | None = None
 
 
-@router.get("", response_model=TransactionHistoryResponse)
+class BatchStatusRequest(BaseModel):
+    """Batch transaction status request"""
+
+    tx_hashes: list[TxHash] = Field(..., min_length=1, max_length=50)
+
+
+class BatchStatusResponse(BaseModel):
+    """Batch transaction status response, in request order"""
+
+    statuses: list[TransactionStatusResponse]
+
+
+def _status_from_receipt(
+    blockchain: BlockchainService, tx_hash: str, receipt: Optional[dict]
+) -> TransactionStatusResponse:
+    """Build a status response from a fetched receipt (None while still pending)"""
+    if not receipt:
+        return TransactionStatusResponse(tx_hash=tx_hash, status="pending")
+
+    # Parse events from the receipt we already have instead of fetching it again
+    events = blockchain.parse_events_from_receipt(receipt)
+
+    return TransactionStatusResponse(
+        tx_hash=tx_hash,
+        status="success" if receipt["status"] == 1 else "failed",
+        block_number=receipt["blockNumber"],
+        gas_used=receipt["gasUsed"],
+        events=[event.model_dump() for event in events],
+    )
+
+
+def _encode_cursor(created_at: datetime, tx_id: int) -> str:
+    """Opaque keyset cursor for the row a page ended on"""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{tx_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of _encode_cursor; raises ValueError on anything malformed"""
+    try:
+        created_at, tx_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(tx_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+@router.get("", response_model=None, responses={200: {"model": TransactionHistoryResponse}})
 async def get_transaction_history(
     agent_id: Optional[str] = Query(None, description="Filter by agent ID"),
     user_address: Optional[str] = Query(None, description="Filter by user address"),
@@ -41,6 +94,9 @@ async def get_transaction_history(
     ),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of transactions to return"),
     offset: int = Query(0, ge=0, description="Number of transactions to skip"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page (preferred over offset)"
+    ),
 ):
     """
     Get transaction history with optional filters
@@ -51,32 +107,88 @@ async def get_transaction_history(
     - status: Filter by transaction status
     - limit: Maximum results (1-100, default 50)
     - offset: Pagination offset (default 0)
+    - cursor: Keyset cursor returned as next_cursor; preferred over offset since each
+      page costs the same regardless of depth. Cursor pages omit total, which would
+      need a scan of every remaining row.
     """
     try:
-        with get_db_connection() as conn:
-            transactions, total = TransactionModel.get_transactions(
+        after = _decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            transactions, total = await TransactionModel.get_transactions(
                 conn,
                 agent_id=agent_id,
                 user_address=user_address,
                 status=status,
                 limit=limit,
                 offset=offset,
+                after=after,
             )
 
-            # Convert to response model
-            transaction_items = [TransactionHistoryItem(**tx) for tx in transactions]
-
-            return TransactionHistoryResponse(
-                transactions=transaction_items,
-                total=total,
-                limit=limit,
-                offset=offset,
-            )
+        # Rows come straight from the typed transactions table with keys matching the
+        # schema fields, so build msgspec Structs directly and skip Pydantic entirely
+        transaction_items = [msg.TransactionHistoryItemMsg(**tx) for tx in transactions]
+
+        response = msg.TransactionHistoryResponseMsg(
+            transactions=transaction_items,
+            total=total,
+            limit=limit,
+            offset=0 if after else offset,
+            next_cursor=(
+                _encode_cursor(transactions[-1]["created_at"], transactions[-1]["id"])
+                if len(transactions) == limit
+                else None
+            ),
+        )
+        return Response(content=msg.encode(response), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch transactions: {str(e)}")
 
 
-@router.post("/status", response_model=TransactionStatusResponse)
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_transactions(
+    agent_id: Optional[str] = Query(None, description="Filter by agent ID"),
+    user_address: Optional[str] = Query(None, description="Filter by user address"),
+    status: Optional[str] = Query(
+        None, description="Filter by status (confirmed, pending, failed)"
+    ),
+):
+    """
+    Export transaction history as NDJSON
+
+    Streams one transaction per line (same fields as the history endpoint), newest
+    first, without materializing the full result set.
+    """
+    try:
+        pool = await get_async_pool()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export transactions: {str(e)}")
+
+    async def _lines() -> AsyncIterator[bytes]:
+        try:
+            async with pool.acquire() as conn:
+                async for tx in TransactionModel.iter_transactions(
+                    conn, agent_id=agent_id, user_address=user_address, status=status
+                ):
+                    yield msg.encode(msg.TransactionHistoryItemMsg(**tx)) + b"\n"
+        except Exception as e:
+            # Headers are already sent; re-raising aborts the response so the client
+            # sees a truncated transfer instead of a silently short export
+            logger.error(f"Transaction export failed: {e}")
+            raise
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/status", response_model=None, responses={200: {"model": TransactionStatusResponse}})
 async def get_transaction_status(
     request: TransactionStatusRequest,
     blockchain: Annotated[BlockchainService, Depends(get_blockchain_service)] = None,
@@ -84,23 +196,42 @@ async def get_transaction_status(
     """Get transaction status and events"""
     try:
         receipt = await blockchain.get_transaction_receipt(request.tx_hash)
+        response = _status_from_receipt(blockchain, request.tx_hash, receipt)
+        return ORJSONResponse(content=response.model_dump())
 
-        if not receipt:
-            return TransactionStatusResponse(tx_hash=request.tx_hash, status="pending")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Parse events
-        events = await blockchain.parse_transaction_events(request.tx_hash)
 
-        return TransactionStatusResponse(
-            tx_hash=request.tx_hash,
-            status="success" if receipt["status"] == 1 else "failed",
-            block_number=receipt["blockNumber"],
-            gas_used=receipt["gasUsed"],
-            events=events,
-        )
+@router.post("/status/batch", response_model=None, responses={200: {"model": BatchStatusResponse}})
+async def get_transaction_status_batch(
+    request: BatchStatusRequest,
+    blockchain: Annotated[BlockchainService, Depends(get_blockchain_service)] = None,
+):
+    """
+    Get status and events for up to 50 transactions in one request
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Receipts are fetched concurrently. A hash with no receipt yet is "pending"; one
+    whose lookup fails (e.g. RPC error) is reported with status "error" without failing
+    the rest of the batch.
+    """
+    receipts = await asyncio.gather(
+        *(blockchain.lookup_transaction_receipt(tx_hash) for tx_hash in request.tx_hashes),
+        return_exceptions=True,
+    )
+
+    statuses = []
+    for tx_hash, receipt in zip(request.tx_hashes, receipts):
+        try:
+            if isinstance(receipt, Exception):
+                raise receipt
+            statuses.append(_status_from_receipt(blockchain, tx_hash, receipt))
+        except Exception as e:
+            logger.warning(f"Status lookup failed for {tx_hash}: {e}")
+            statuses.append(TransactionStatusResponse(tx_hash=tx_hash, status="error"))
+
+    response = BatchStatusResponse(statuses=statuses)
+    return ORJSONResponse(content=response.model_dump())
 
 
 class ExecuteTransactionRequest(BaseModel):
@@ -137,7 +268,7 @@ async def execute_transaction(request: ExecuteTransactionRequest):
     )
 
 
-@router.post("/validate")
+@router.post("/validate", response_model=None)
 async def validate_transaction(
     agent_id: str,
     target: str,
@@ -151,12 +282,14 @@ async def validate_transaction(
             agent_id, target, function_selector, user_address
         )
 
-        return {
-            "valid": is_valid,
-            "agent_id": agent_id,
-            "target": target,
-            "function": function_selector,
-        }
+        return ORJSONResponse(
+            content={
+                "valid": is_valid,
+                "agent_id": agent_id,
+                "target": target,
+                "function": function_selector,
+            }
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,6 +2,7 @@
 Web3 blockchain client wrapper
 """
 
+import aiohttp
 from web3 import AsyncWeb3
 from web3.eth import AsyncEth
 from web3.providers import AsyncHTTPProvider
@@ -9,10 +10,22 @@ from eth_account import Account
 from loguru import logger
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from app.config import settings
 
+# Many RPC providers reject or throttle larger JSON-RPC batches
+MAX_RPC_BATCH_SIZE = 10
+
+
+class RPCError(Exception):
+    """Error returned by the node for one request of a JSON-RPC batch"""
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
 
 class BlockchainClient:
     """Async Web3 client for Somnia blockchain"""
@@ -20,18 +33,39 @@ class BlockchainClient:
     def __init__(self):
         self.w3: Optional[AsyncWeb3] = None
         self.contracts: Dict[str, Any] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
         self._initialized = False
 
+    @property
+    def initialized(self) -> bool:
+        """Whether initialize() has completed; lets callers skip the await entirely"""
+        return self._initialized
+
     async def initialize(self):
         """Initialize Web3 connection and load contracts"""
         if self._initialized:
             return
 
         try:
+            # One pooled keep-alive session shared by every RPC request, so calls reuse
+            # open TCP/TLS connections instead of handshaking each time
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=settings.RPC_POOL_SIZE,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=settings.RPC_KEEPALIVE_TIMEOUT,
+                    ),
+                    raise_for_status=True,
+                )
+
             # Create async Web3 instance
-            self.w3 = AsyncWeb3(
-                AsyncHTTPProvider(settings.SOMNIA_RPC_URL), modules={"eth": (AsyncEth,)}
+            provider = AsyncHTTPProvider(
+                settings.SOMNIA_RPC_URL,
+                request_kwargs={"timeout": aiohttp.ClientTimeout(total=settings.RPC_TIMEOUT)},
             )
+            await provider.cache_async_session(self._session)
+            self.w3 = AsyncWeb3(provider, modules={"eth": (AsyncEth,)})
 
             # Test connection
             is_connected = await self.w3.is_connected()
@@ -133,6 +167,56 @@ class BlockchainClient:
             logger.error(f"Transaction wait failed for {tx_hash}: {e}")
             return None
 
+    async def batch_call(self, calls: List[Tuple[str, List[Any]]]) -> List[Union[Any, RPCError]]:
+        """
+        Send several JSON-RPC requests in batched POSTs (MAX_RPC_BATCH_SIZE per POST)
+
+        Args:
+            calls: (method, params) pairs, e.g. ("eth_call", [{"to": ..., "data": ...}, "latest"])
+
+        Returns:
+            Raw results in call order; entries whose request failed hold an RPCError
+            (e.g. "execution reverted") so callers can report the real cause
+        """
+        if self._session is None or self._session.closed:
+            raise RuntimeError("Blockchain client not initialized")
+
+        results: List[Any] = [RPCError("No response for batched RPC call")] * len(calls)
+        timeout = aiohttp.ClientTimeout(total=settings.RPC_TIMEOUT)
+
+        for start in range(0, len(calls), MAX_RPC_BATCH_SIZE):
+            payload = [
+                {"jsonrpc": "2.0", "id": start + i, "method": method, "params": params}
+                for i, (method, params) in enumerate(calls[start : start + MAX_RPC_BATCH_SIZE])
+            ]
+            async with self._session.post(
+                settings.SOMNIA_RPC_URL, json=payload, timeout=timeout
+            ) as resp:
+                responses = await resp.json()
+
+            if not isinstance(responses, list):
+                # Providers without batch support answer with a single error object
+                raise ValueError(f"RPC batch request rejected: {responses}")
+
+            for item in responses:
+                if "error" in item:
+                    error = item["error"]
+                    logger.error(f"Batched RPC call {item.get('id')} failed: {error}")
+                    results[item["id"]] = RPCError(
+                        error.get("message", str(error)), error.get("code"), error.get("data")
+                    )
+                    continue
+                results[item["id"]] = item.get("result")
+
+        return results
+
+    async def close(self):
+        """Close the pooled RPC HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._initialized = False
+
     def get_contract(self, name: str):
         """Get loaded contract instance"""
         if name not in self.contracts:
@@ -29,11 +29,19 @@ class Settings(BaseSettings):
     SOMNIA_RPC_URL: str
     # Somnia Testnet chain ID (updated)
     CHAIN_ID: int = 50312
+    # Pooled keep-alive HTTP connections to the RPC node
+    RPC_POOL_SIZE: int = 200
+    RPC_KEEPALIVE_TIMEOUT: int = 60
+    RPC_TIMEOUT: int = 30
 
     # Deployed Contracts
     AGENT_REGISTRY_ADDRESS: str
     CONTRACT_MIND_HUB_ADDRESS: str
 
+    # Agent lookups cache (seconds)
+    AGENT_TTL_SECONDS: int = 60
+    AGENT_LIST_TTL_SECONDS: int = 10
+
     # AI Services - Multi-LLM Support
     DEFAULT_LLM_PROVIDER: str = "gemini"  # gemini, claude, or openai
 
@@ -62,6 +70,9 @@ class Settings(BaseSettings):
     dbname: str
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    ASYNC_DB_POOL_MIN_SIZE: int = 5
+    ASYNC_DB_POOL_MAX_SIZE: int = 20
+    ASYNC_DB_STATEMENT_CACHE_SIZE: int = 1024
 
     # Redis
     REDIS_URL: str
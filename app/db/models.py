@@ -3,7 +3,7 @@ Database models and table creation SQL
 """
 
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
 from loguru import logger
 
 
@@ -48,11 +48,22 @@ CREATE TABLE IF NOT EXISTS transactions (
 );
 
 CREATE INDEX IF NOT EXISTS idx_tx_hash ON transactions(tx_hash);
-CREATE INDEX IF NOT EXISTS idx_user_address ON transactions(user_address);
-CREATE INDEX IF NOT EXISTS idx_agent_id ON transactions(agent_id);
 CREATE INDEX IF NOT EXISTS idx_status ON transactions(status);
 CREATE INDEX IF NOT EXISTS idx_block_number ON transactions(block_number);
 CREATE INDEX IF NOT EXISTS idx_created_at ON transactions(created_at);
+
+-- Transaction history: filter column first, then the created_at DESC sort
+CREATE INDEX IF NOT EXISTS idx_tx_user_created
+    ON transactions(user_address, created_at DESC)
+    INCLUDE (agent_id, status, tx_hash, function_name);
+CREATE INDEX IF NOT EXISTS idx_tx_agent_created ON transactions(agent_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_tx_status_created
+    ON transactions(status, created_at DESC)
+    WHERE status IN ('pending', 'failed');
+
+-- Superseded by the composites above (same leading column); don't make inserts pay for them
+DROP INDEX IF EXISTS idx_user_address;
+DROP INDEX IF EXISTS idx_agent_id;
 """
 
 CREATE_AGENT_METRICS_TABLE = """
@@ -126,6 +137,15 @@ CREATE INDEX IF NOT EXISTS idx_agents_target ON agents_cache(target_address);
 CREATE INDEX IF NOT EXISTS idx_agents_active ON agents_cache(active);
 """
 
+# Hub-awareness of a target contract is fixed at deployment; each address is probed once
+CREATE_CONTRACT_TYPES_TABLE = """
+CREATE TABLE IF NOT EXISTS contract_types (
+    address VARCHAR(42) PRIMARY KEY,
+    type VARCHAR(20) NOT NULL,
+    checked_at TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
 
 def init_database(conn):
     """
@@ -142,6 +162,7 @@ def init_database(conn):
         cursor.execute(CREATE_AGENT_METRICS_TABLE)
         cursor.execute(CREATE_USER_METRICS_TABLE)
         cursor.execute(CREATE_AGENTS_CACHE_TABLE)
+        cursor.execute(CREATE_CONTRACT_TYPES_TABLE)
 
         conn.commit()
         cursor.close()
@@ -155,6 +176,50 @@ def init_database(conn):
         raise
 
 
+# Transaction history queries (asyncpg). NULL-guarded filters keep the statement text
+# identical for every filter combination, so each connection's statement cache holds a
+# single prepared statement per query (see app.db.pool)
+_TRANSACTIONS_FILTER_SQL = """
+    WHERE ($1::text IS NULL OR agent_id = $1)
+      AND ($2::text IS NULL OR user_address = $2)
+      AND ($3::text IS NULL OR status = $3)
+"""
+
+_TRANSACTIONS_COLUMNS_SQL = """
+    id, tx_hash, user_address, agent_id, target_address,
+    function_name, execution_mode, status, block_number,
+    gas_used, intent_action, intent_protocol, created_at, confirmed_at
+"""
+
+# Offset pages: the window count comes back with the page in one scan
+TRANSACTIONS_PAGE_SQL = f"""
+SELECT {_TRANSACTIONS_COLUMNS_SQL}, COUNT(*) OVER () AS total_count
+FROM transactions
+{_TRANSACTIONS_FILTER_SQL}
+ORDER BY created_at DESC, id DESC
+LIMIT $4 OFFSET $5
+"""
+
+# Keyset pages: no count, so a page only reads its own rows off the index
+TRANSACTIONS_KEYSET_SQL = f"""
+SELECT {_TRANSACTIONS_COLUMNS_SQL}
+FROM transactions
+{_TRANSACTIONS_FILTER_SQL}
+  AND (created_at, id) < ($4::timestamp, $5::int)
+ORDER BY created_at DESC, id DESC
+LIMIT $6
+"""
+
+TRANSACTIONS_COUNT_SQL = f"SELECT COUNT(*) FROM transactions {_TRANSACTIONS_FILTER_SQL}"
+
+TRANSACTIONS_EXPORT_SQL = f"""
+SELECT {_TRANSACTIONS_COLUMNS_SQL}
+FROM transactions
+{_TRANSACTIONS_FILTER_SQL}
+ORDER BY created_at DESC, id DESC
+"""
+
+
 class TransactionModel:
     """Helper class for transaction operations"""
 
@@ -300,80 +365,68 @@ class TransactionModel:
         ]
 
     @staticmethod
-    def get_transactions(
+    async def get_transactions(
         conn,
         agent_id: Optional[str] = None,
         user_address: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> tuple[List[Dict[str, Any]], int]:
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[List[Dict[str, Any]], Optional[int]]:
         """
         Get transactions with optional filters
         Returns tuple of (transactions, total_count)
-        """
-        cursor = conn.cursor()
 
-        # Build WHERE clause dynamically
-        where_clauses = []
-        params = []
+        Takes an asyncpg connection (see app.db.pool). Pass after=(created_at, id) of the
+        last row seen for keyset pagination; offset is ignored and total_count is None,
+        since counting would scan every remaining row on each page.
+        """
+        filters = (agent_id or None, user_address or None, status or None)
 
-        if agent_id:
-            where_clauses.append("agent_id = %s")
-            params.append(agent_id)
+        if after:
+            rows = await conn.fetch(TRANSACTIONS_KEYSET_SQL, *filters, *after, limit)
+            return [dict(row) for row in rows], None
 
-        if user_address:
-            where_clauses.append("user_address = %s")
-            params.append(user_address)
+        rows = await conn.fetch(TRANSACTIONS_PAGE_SQL, *filters, limit, offset)
 
-        if status:
-            where_clauses.append("status = %s")
-            params.append(status)
+        transactions = [dict(row) for row in rows]
+        for tx in transactions:
+            del tx["total_count"]
 
-        where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+        if rows:
+            total = rows[0]["total_count"]
+        elif offset:
+            # Paged past the end: the window count has no row to ride on
+            total = await conn.fetchval(TRANSACTIONS_COUNT_SQL, *filters)
+        else:
+            total = 0
 
-        # Get total count
-        count_query = f"SELECT COUNT(*) FROM transactions {where_sql}"
-        cursor.execute(count_query, tuple(params))
-        total = cursor.fetchone()[0]
+        return transactions, total
 
-        # Get transactions
-        query = f"""
-            SELECT id, tx_hash, user_address, agent_id, target_address,
-                   function_name, execution_mode, status, block_number,
-                   gas_used, intent_action, intent_protocol, created_at, confirmed_at
-            FROM transactions
-            {where_sql}
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
+    @staticmethod
+    async def iter_transactions(
+        conn,
+        agent_id: Optional[str] = None,
+        user_address: Optional[str] = None,
+        status: Optional[str] = None,
+        prefetch: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        params.extend([limit, offset])
-        cursor.execute(query, tuple(params))
-
-        rows = cursor.fetchall()
-        cursor.close()
-
-        transactions = [
-            {
-                "id": row[0],
-                "tx_hash": row[1],
-                "user_address": row[2],
-                "agent_id": row[3],
-                "target_address": row[4],
-                "function_name": row[5],
-                "execution_mode": row[6],
-                "status": row[7],
-                "block_number": row[8],
-                "gas_used": row[9],
-                "intent_action": row[10],
-                "intent_protocol": row[11],
-                "created_at": row[12],
-                "confirmed_at": row[13],
-            }
-            for row in rows
-        ]
+        Stream every matching transaction, newest first
 
-        return transactions, total
+        Takes an asyncpg connection and reads through a server-side cursor, so only
+        `prefetch` rows are held in memory at a time.
+        """
+        async with conn.transaction():
+            async for row in conn.cursor(
+                TRANSACTIONS_EXPORT_SQL,
+                agent_id or None,
+                user_address or None,
+                status or None,
+                prefetch=prefetch,
+            ):
+                yield dict(row)
 
 
 class AgentCacheModel:
@@ -541,6 +594,34 @@ class AgentCacheModel:
         return count
 
 
+class ContractTypeModel:
+    """Helper class for contract_types operations"""
+
+    @staticmethod
+    def get(conn, address: str) -> Optional[str]:
+        """Get the recorded type ("hub-aware" or "regular") for a contract address"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT type FROM contract_types WHERE address = %s", (address.lower(),))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else None
+
+    @staticmethod
+    def insert(conn, address: str, contract_type: str):
+        """Record a contract's type; the first result for an address wins"""
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO contract_types (address, type)
+            VALUES (%s, %s)
+            ON CONFLICT (address) DO NOTHING
+            """,
+            (address.lower(), contract_type),
+        )
+        conn.commit()
+        cursor.close()
+
+
 class AgentFunctionAuthorizationModel:
     """Helper class for agent function authorization operations"""
 
@@ -601,6 +682,28 @@ class AgentFunctionAuthorizationModel:
 
         return {row[0]: row[1] for row in rows}
 
+    @staticmethod
+    def get_authorizations_for_agents(conn, agent_ids: List[str]) -> Dict[str, Dict[str, bool]]:
+        """Get function authorization status for several agents in one query"""
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT agent_id, function_name, authorized
+            FROM agent_function_authorizations
+            WHERE agent_id = ANY(%s)
+            """,
+            (list(agent_ids),),
+        )
+
+        rows = cursor.fetchall()
+        cursor.close()
+
+        authorizations: Dict[str, Dict[str, bool]] = {}
+        for agent_id, function_name, authorized in rows:
+            authorizations.setdefault(agent_id, {})[function_name] = authorized
+        return authorizations
+
 
 # SQL for chat history table
 CREATE_CHAT_MESSAGES_TABLE = """
@@ -0,0 +1,91 @@
+"""
+Async database connection pool using asyncpg
+
+Used by hot read paths that should not tie up a worker thread per query; everything
+else keeps using the psycopg2 pool in app.db.session.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+import asyncpg
+from loguru import logger
+
+from app.config import settings
+from app.db.models import TRANSACTIONS_KEYSET_SQL, TRANSACTIONS_PAGE_SQL
+
+
+# Global async connection pool
+_async_pool: Optional[asyncpg.Pool] = None
+_init_lock = asyncio.Lock()
+
+
+async def _prepare_statements(conn: asyncpg.Connection):
+    """
+    Prepare hot queries on each new connection
+
+    Running them once with LIMIT 0 parses and plans them into the connection's statement
+    cache, so no request pays that cost. conn.prepare() would bypass the cache. This is
+    only an optimization: a failure (e.g. tables not created yet) must not stop the pool.
+    """
+    try:
+        await conn.fetch(TRANSACTIONS_PAGE_SQL, None, None, None, 0, 0)
+        await conn.fetch(TRANSACTIONS_KEYSET_SQL, None, None, None, datetime.now(), 0, 0)
+    except Exception as e:
+        logger.warning(f"Skipping statement warm-up on new connection: {e}")
+
+
+async def init_async_pool() -> asyncpg.Pool:
+    """Initialize the asyncpg connection pool"""
+    global _async_pool
+
+    async with _init_lock:
+        if _async_pool is None:
+            try:
+                _async_pool = await asyncpg.create_pool(
+                    user=settings.user,
+                    password=settings.password,
+                    host=settings.host,
+                    port=settings.port,
+                    database=settings.dbname,
+                    ssl="prefer",  # Supabase requires SSL
+                    min_size=settings.ASYNC_DB_POOL_MIN_SIZE,
+                    max_size=settings.ASYNC_DB_POOL_MAX_SIZE,
+                    # Prepared statements are cached per connection and reused
+                    statement_cache_size=settings.ASYNC_DB_STATEMENT_CACHE_SIZE,
+                    init=_prepare_statements,
+                    timeout=10,
+                )
+                logger.info(
+                    f"✅ Async database pool initialized: {settings.host}:{settings.port}/{settings.dbname}"
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to create async database pool: {e}")
+                raise
+
+    return _async_pool
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """
+    Get the asyncpg pool, creating it on first use
+
+    Usage:
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("SELECT * FROM table")
+    """
+    if _async_pool is None:
+        return await init_async_pool()
+    return _async_pool
+
+
+async def close_async_pool():
+    """Close all async database connections"""
+    global _async_pool
+
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+        logger.info("Async database pool closed")
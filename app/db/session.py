@@ -2,10 +2,11 @@
 Database connection management using psycopg2
 """
 
+import asyncio
 import psycopg2
 from psycopg2 import pool
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Callable, Generator, TypeVar
 from loguru import logger
 
 from app.config import settings
@@ -14,6 +15,8 @@ from app.config import settings
 # Global connection pool
 _connection_pool = None
 
+T = TypeVar("T")
+
 
 def init_db_pool():
     """Initialize the database connection pool"""
@@ -21,7 +24,8 @@ def init_db_pool():
 
     if _connection_pool is None:
         try:
-            _connection_pool = psycopg2.pool.SimpleConnectionPool(
+            # Threaded pool: connections are also checked out from worker threads (run_db)
+            _connection_pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn=1,
                 maxconn=settings.DATABASE_POOL_SIZE,
                 user=settings.user,
@@ -78,6 +82,21 @@ def get_db_connection():
             _connection_pool.putconn(conn)
 
 
+async def run_db(fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run a blocking database helper in a worker thread so the event loop is not blocked
+
+    Usage:
+        await run_db(AgentCacheModel.upsert, agent_data)  # calls upsert(conn, agent_data)
+    """
+
+    def _call() -> T:
+        with get_db_connection() as conn:
+            return fn(conn, *args)
+
+    return await asyncio.to_thread(_call)
+
+
 def get_db() -> Generator:
     """
     FastAPI dependency for database connection
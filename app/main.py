@@ -9,15 +9,20 @@ from loguru import logger
 
 from app.config import settings
 from app.api.v1 import router as api_router
+from app.api.orjson import ORJSONResponse
+from app.blockchain.client import blockchain_client
 from app.middleware.error_handler import setup_exception_handlers
 from app.db.session import init_db_pool, close_db_pool, get_db_connection
+from app.db.pool import init_async_pool, close_async_pool
 from app.db.models import init_database
+from app.utils.logger import enqueue_default_sink
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
+    enqueue_default_sink()
     logger.info("🚀 Starting ContractMind Backend...")
 
     # Initialize database connection pool
@@ -29,6 +34,9 @@ async def lifespan(app: FastAPI):
     with get_db_connection() as conn:
         init_database(conn)
 
+    # Async pool warms its statement cache against the tables, so it comes after them
+    await init_async_pool()
+
     logger.info("✅ ContractMind Backend started successfully!")
 
     yield
@@ -36,11 +44,18 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down ContractMind Backend...")
 
+    # Close pooled RPC connections
+    await blockchain_client.close()
+
     # Close database connections
     close_db_pool()
+    await close_async_pool()
 
     logger.info("👋 ContractMind Backend stopped")
 
+    # Flush records still queued for the logging sinks
+    await logger.complete()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -51,6 +66,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -87,6 +103,8 @@ async def root():
 
 
 if __name__ == "__main__":
+    import importlib.util
+
     import uvicorn
 
     uvicorn.run(
@@ -96,4 +114,6 @@ if __name__ == "__main__":
         reload=settings.DEBUG,
         workers=1 if settings.DEBUG else settings.WORKERS,
         log_level=settings.LOG_LEVEL.lower(),
+        # libuv-backed event loop for the RPC/DB-bound handlers (not available on Windows)
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
     )
@@ -4,6 +4,7 @@ Exception handlers and middleware
 
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from loguru import logger
@@ -67,7 +68,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={
             "error": "VALIDATION_ERROR",
             "message": "Invalid request data",
-            "details": exc.errors(),
+            # Encode so validator exceptions in the error ctx don't break serialization
+            "details": jsonable_encoder(exc.errors()),
         },
     )
 
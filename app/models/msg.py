@@ -0,0 +1,51 @@
+"""
+msgspec Structs for hot serialization paths
+
+These mirror Pydantic schemas in app.models.schemas field for field. The Pydantic
+models stay the source of truth for OpenAPI docs; these are only used to encode
+large list responses without per-item validation.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+import msgspec
+
+
+# Shared encoder; Structs with omit_defaults drop None fields like BaseResponseModel
+_encoder = msgspec.json.Encoder()
+
+
+def encode(obj) -> bytes:
+    """Encode a Struct (or plain python objects) to JSON bytes"""
+    return _encoder.encode(obj)
+
+
+# Transaction Structs
+class TransactionHistoryItemMsg(msgspec.Struct, omit_defaults=True):
+    """Transaction history item (see schemas.TransactionHistoryItem)"""
+
+    id: int
+    tx_hash: str
+    user_address: str
+    target_address: str
+    execution_mode: str
+    status: str
+    created_at: datetime
+    agent_id: Optional[str] = None
+    function_name: Optional[str] = None
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    intent_action: Optional[str] = None
+    intent_protocol: Optional[str] = None
+    confirmed_at: Optional[datetime] = None
+
+
+class TransactionHistoryResponseMsg(msgspec.Struct, omit_defaults=True, kw_only=True):
+    """Transaction history response (see schemas.TransactionHistoryResponse)"""
+
+    transactions: List[TransactionHistoryItemMsg]
+    total: Optional[int] = None
+    limit: int
+    offset: int
+    next_cursor: Optional[str] = None
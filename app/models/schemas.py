@@ -2,11 +2,59 @@
 Pydantic schemas for API requests and responses
 """
 
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List, Dict, Any
+import re
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict, model_serializer
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
 
 
+_TX_HASH_RE = re.compile(r"^0x[0-9a-fA-F]{64}$")
+
+
+def to_bytes32(value: Any) -> bytes:
+    """
+    Normalize an agent id to the bytes32 used on-chain
+
+    Accepts raw bytes (including HexBytes), a 0x-prefixed 32-byte hex string, or a plain
+    string identifier which is right-padded with zero bytes.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        value = bytes(value)
+    elif value.startswith("0x"):
+        value = bytes.fromhex(value[2:])
+    else:
+        return value.encode().ljust(32, b"\x00")[:32]
+
+    if len(value) != 32:
+        raise ValueError(f"Expected 32 bytes, got {len(value)}")
+    return value
+
+
+def _validate_tx_hash(value: str) -> str:
+    if not _TX_HASH_RE.match(value):
+        raise ValueError("Transaction hash must be 0x followed by 64 hex characters")
+    return value.lower()
+
+
+# Transaction hash validated and lowercased once at the request boundary
+TxHash = Annotated[str, AfterValidator(_validate_tx_hash)]
+
+
+# Base Schemas
+class BaseResponseModel(BaseModel):
+    """
+    Base for response models with many optional fields
+
+    None-valued fields are left out of every serialization (model_dump, FastAPI
+    response_model encoding, and when nested inside another model) instead of being
+    sent as null.
+    """
+
+    @model_serializer(mode="wrap")
+    def _drop_none(self, handler):
+        return {key: value for key, value in handler(self).items() if value is not None}
+
+
 # Function Schemas
 class FunctionInput(BaseModel):
     """Function input parameter"""
@@ -41,7 +89,7 @@ class AgentBase(BaseModel):
     config_ipfs: str
 
 
-class AgentResponse(BaseModel):
+class AgentResponse(BaseResponseModel):
     """Agent response model"""
 
     id: str
@@ -88,7 +136,7 @@ class TransactionRequest(BaseModel):
     execution_mode: str  # "hub" or "direct"
 
 
-class PreparedTransaction(BaseModel):
+class PreparedTransaction(BaseResponseModel):
     """Prepared transaction ready for signing"""
 
     to: str
@@ -140,7 +188,7 @@ class TransactionReceipt(BaseModel):
     events: List[TransactionEvent] = Field(default_factory=list)
 
 
-class TransactionHistoryItem(BaseModel):
+class TransactionHistoryItem(BaseResponseModel):
     """Transaction history item"""
 
     id: int
@@ -163,9 +211,10 @@ class TransactionHistoryResponse(BaseModel):
     """Transaction history response"""
 
     transactions: List[TransactionHistoryItem]
-    total: int
+    total: Optional[int] = None  # Omitted on cursor pages
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 # Analytics Schemas
@@ -2,21 +2,120 @@
 Blockchain service for contract interactions
 """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from cachetools import LRUCache, TTLCache
 from web3 import Web3
+from web3.exceptions import (
+    BadFunctionCallOutput,
+    ContractLogicError,
+    LogTopicError,
+    MismatchedABI,
+    TransactionNotFound,
+)
 from eth_abi import encode
+from eth_abi.exceptions import DecodingError
 from loguru import logger
 
-from app.blockchain.client import blockchain_client
+from app.blockchain.client import RPCError, blockchain_client
+from app.config import settings
 from app.models.schemas import (
     AgentResponse,
+    AgentStats,
     TransactionEvent,
     AgentFunction,
     FunctionInput,
     FunctionOutput,
+    to_bytes32,
+)
+from app.db.session import get_db_connection, run_db
+from app.db.models import AgentCacheModel, AgentFunctionAuthorizationModel, ContractTypeModel
+
+# Agent metadata changes rarely: serve repeat lookups from a short-lived cache and keep
+# the last known value per agent so a failing RPC/database can fall back to it
+_agent_cache: TTLCache = TTLCache(maxsize=4096, ttl=settings.AGENT_TTL_SECONDS)
+_agent_name_cache: TTLCache = TTLCache(maxsize=4096, ttl=settings.AGENT_TTL_SECONDS)
+_agent_last_known: LRUCache = LRUCache(maxsize=4096)
+
+# Agent list pages and on-chain active flags are read on nearly every request; a few
+# seconds of staleness is fine and absorbs bursts
+_agent_list_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.AGENT_LIST_TTL_SECONDS)
+_agent_active_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.AGENT_LIST_TTL_SECONDS)
+_inflight_locks: Dict[Tuple[int, Any], asyncio.Lock] = {}
+
+# Whether a target contract is hub-aware never changes once it is known (persisted in
+# the contract_types table; this only saves the database round trip)
+_contract_type_cache: LRUCache = LRUCache(maxsize=4096)
+
+# Just enough ABI to probe a contract for the hub's trustedHub() getter
+_TRUSTED_HUB_ABI = [
+    {
+        "inputs": [],
+        "name": "trustedHub",
+        "outputs": [{"type": "address"}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+]
+
+# topic0 of the hub's FunctionExecuted event, compared before any ABI decoding
+_FUNCTION_EXECUTED_TOPIC = Web3.keccak(
+    text="FunctionExecuted(bytes32,address,address,bytes4,bool,bytes)"
 )
-from app.db.session import get_db_connection
-from app.db.models import AgentCacheModel, AgentFunctionAuthorizationModel
+
+
+def invalidate_agent_cache(agent_id: str) -> None:
+    """Drop cached lookups for an agent after it is registered or modified"""
+    _agent_cache.pop(agent_id, None)
+    _agent_last_known.pop(agent_id, None)
+    _agent_active_cache.pop(agent_id, None)
+    _agent_list_cache.clear()
+    for name, cached_id in list(_agent_name_cache.items()):
+        if cached_id == agent_id:
+            _agent_name_cache.pop(name, None)
+
+
+async def _get_or_load(cache: TTLCache, key: Any, load: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return cache[key], loading it at most once across concurrent misses
+
+    Waiters for the same key share one load; if it raises, nothing is cached and each
+    waiter retries.
+    """
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
+    lock_key = (id(cache), key)
+    lock = _inflight_locks.setdefault(lock_key, asyncio.Lock())
+    try:
+        async with lock:
+            try:
+                return cache[key]
+            except KeyError:
+                value = await load()
+                cache[key] = value
+                return value
+    finally:
+        if not lock.locked():
+            _inflight_locks.pop(lock_key, None)
+
+
+@lru_cache(maxsize=4096)
+def _agent_id_to_bytes32(agent_id: str) -> bytes:
+    """Memoized to_bytes32 for the handful of agent ids seen on hot paths"""
+    return to_bytes32(agent_id)
+
+
+@lru_cache(maxsize=4096)
+def _selector_to_bytes4(function_selector: str) -> bytes:
+    """Convert a 0x-hex (or raw 4-char) function selector to bytes4"""
+    if function_selector.startswith("0x"):
+        return bytes.fromhex(function_selector[2:])
+    return function_selector[:4].encode()
 
 
 class BlockchainService:
@@ -24,24 +123,35 @@ class BlockchainService:
 
     def __init__(self):
         self.client = blockchain_client
+        # Hub contracts only exist once the client is initialized, so the event decoder is
+        # bound on first use
+        self._fn_exec_event = None
 
     def parse_abi_functions(
-        self, abi: List[Dict[str, Any]], agent_id: str = None
+        self,
+        abi: List[Dict[str, Any]],
+        agent_id: str = None,
+        authorizations: Optional[Dict[str, bool]] = None,
     ) -> List[AgentFunction]:
-        """Parse ABI and extract function information with authorization status"""
+        """
+        Parse ABI and extract function information with authorization status
+
+        Authorizations are loaded for agent_id unless already provided by the caller.
+        """
         if not abi:
             return []
 
         # Get authorization status from database if agent_id provided
-        authorizations = {}
-        if agent_id:
-            try:
-                with get_db_connection() as conn:
-                    authorizations = AgentFunctionAuthorizationModel.get_authorizations(
-                        conn, agent_id
-                    )
-            except Exception as e:
-                logger.error(f"Error fetching authorizations: {e}")
+        if authorizations is None:
+            authorizations = {}
+            if agent_id:
+                try:
+                    with get_db_connection() as conn:
+                        authorizations = AgentFunctionAuthorizationModel.get_authorizations(
+                            conn, agent_id
+                        )
+                except Exception as e:
+                    logger.error(f"Error fetching authorizations: {e}")
 
         functions = []
         for item in abi:
@@ -73,180 +183,218 @@ class BlockchainService:
     ) -> List[AgentResponse]:
         """Get all registered agents from database cache with analytics, optionally filtered by owner"""
         try:
-            # Query from database cache
-            with get_db_connection() as conn:
-                agents_data = AgentCacheModel.get_all_active(conn, limit=limit, owner=owner)
-
-            # Convert to AgentResponse objects
-            agents = []
-            for agent_data in agents_data:
-                # Parse functions from ABI if available
-                functions = None
-                if agent_data.get("abi"):
-                    functions = self.parse_abi_functions(agent_data["abi"], agent_data["agent_id"])
-
-                # Get analytics for this agent
-                analytics = None
-                try:
-                    with get_db_connection() as conn:
-                        cursor = conn.cursor()
-                        cursor.execute(
-                            """
-                            SELECT 
-                                COUNT(*) as total_calls,
-                                COUNT(DISTINCT user_address) as unique_users,
-                                COALESCE(SUM(gas_used), 0) as total_gas,
-                                AVG(CASE WHEN status = 'confirmed' THEN 1.0 ELSE 0.0 END) as success_rate
-                            FROM transactions
-                            WHERE agent_id = %s
-                            """,
-                            (agent_data["agent_id"],),
-                        )
-                        row = cursor.fetchone()
-                        if row and row[0] > 0:
-                            from app.models.schemas import AgentStats
-
-                            analytics = AgentStats(
-                                agent_id=agent_data["agent_id"],
-                                agent_name=agent_data["name"],
-                                total_calls=row[0] or 0,
-                                unique_users=row[1] or 0,
-                                total_gas_used=row[2] or 0,
-                                success_rate=float(row[3]) if row[3] else 0.0,
-                                average_gas_per_call=int(row[2] / row[0]) if row[0] > 0 else 0,
-                            )
-                        cursor.close()
-                except Exception as e:
-                    logger.debug(f"No analytics for agent {agent_data['agent_id']}: {e}")
-
-                agents.append(
-                    AgentResponse(
-                        id=agent_data["agent_id"],
-                        target_address=agent_data["target_address"],
-                        owner=agent_data["owner"],
-                        name=agent_data["name"],
-                        config_ipfs=agent_data["config_ipfs"],
-                        active=agent_data["active"],
-                        created_at=agent_data["created_at"],
-                        functions=functions,
-                        analytics=analytics,
-                    )
-                )
-
-            logger.info(f"Retrieved {len(agents)} agents from cache")
-            return agents
-
+            return await _get_or_load(
+                _agent_list_cache,
+                (skip, limit, owner),
+                lambda: self._fetch_all_agents(skip=skip, limit=limit, owner=owner),
+            )
         except Exception as e:
             logger.error(f"Error fetching agents: {e}")
             return []
 
-    async def get_agent(self, agent_id: str) -> Optional[AgentResponse]:
-        """Get agent by ID - checks database cache first, then blockchain"""
-        try:
-            # First, try to get from database cache
-            with get_db_connection() as conn:
-                agent_data = AgentCacheModel.get_by_id(conn, agent_id)
-
-                if agent_data:
-                    logger.info(f"Found agent {agent_id} in database cache")
-
-                    # Parse functions from ABI if available
-                    functions = None
-                    abi = agent_data.get("abi")
-                    if abi:
-                        functions = self.parse_abi_functions(abi, agent_id)
-
-                    return AgentResponse(
-                        id=agent_data["agent_id"],
-                        target_address=agent_data["target_address"],
-                        owner=agent_data["owner"],
-                        name=agent_data["name"],
-                        config_ipfs=agent_data["config_ipfs"],
-                        active=agent_data["active"],
-                        created_at=agent_data["created_at"],
-                        functions=functions,
-                        abi=abi,  # Include full ABI
+    async def _fetch_all_agents(
+        self, skip: int = 0, limit: int = 100, owner: str = None
+    ) -> List[AgentResponse]:
+        """Load a page of agents with authorizations and analytics from the database"""
+        # Query from database cache
+        with get_db_connection() as conn:
+            agents_data = AgentCacheModel.get_all_active(conn, limit=limit, owner=owner)
+
+        agent_ids = [agent_data["agent_id"] for agent_data in agents_data]
+
+        # Fetch authorizations and analytics for the whole page with one query each
+        # instead of one round-trip per agent
+        authorizations: Dict[str, Dict[str, bool]] = {}
+        stats_rows: Dict[str, tuple] = {}
+        if agent_ids:
+            try:
+                with get_db_connection() as conn:
+                    authorizations = AgentFunctionAuthorizationModel.get_authorizations_for_agents(
+                        conn, agent_ids
                     )
+            except Exception as e:
+                logger.error(f"Error fetching authorizations: {e}")
 
-            # If not in cache, try blockchain
-            logger.info(f"Agent {agent_id} not in cache, querying blockchain...")
-            registry = self.client.get_contract("AgentRegistry")
-
-            # Convert agent_id to bytes32 if it's a hex string
-            if isinstance(agent_id, str) and agent_id.startswith("0x"):
-                agent_id_bytes = bytes.fromhex(agent_id[2:])
-            else:
-                agent_id_bytes = agent_id.encode()
-                agent_id_bytes = agent_id_bytes.ljust(32, b"\x00")[:32]
-
-            # Get agent data
-            agent_data = await registry.functions.getAgent(agent_id_bytes).call()
-
-            # Agent struct in contract is:
-            # struct Agent { address owner; address targetContract; string name; string configIPFS; bool active; uint256 createdAt; uint256 updatedAt; }
-            owner = agent_data[0]
-            target_contract = agent_data[1]
-            name = agent_data[2]
-            config_ipfs = agent_data[3]
-            active = agent_data[4]
-            created_at = None
             try:
-                # createdAt is index 5 if returned
-                if len(agent_data) > 5 and agent_data[5]:
-                    from datetime import datetime
-
-                    created_at = datetime.utcfromtimestamp(int(agent_data[5]))
-            except Exception:
-                # Keep created_at as None if parsing fails
-                created_at = None
-
-            # Parse response
-            return AgentResponse(
-                id=agent_id,
-                target_address=target_contract,
-                owner=owner,
-                name=name,
-                config_ipfs=config_ipfs,
-                active=active,
-                created_at=created_at,
+                with get_db_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(
+                        """
+                        SELECT 
+                            agent_id,
+                            COUNT(*) as total_calls,
+                            COUNT(DISTINCT user_address) as unique_users,
+                            COALESCE(SUM(gas_used), 0) as total_gas,
+                            AVG(CASE WHEN status = 'confirmed' THEN 1.0 ELSE 0.0 END) as success_rate
+                        FROM transactions
+                        WHERE agent_id = ANY(%s)
+                        GROUP BY agent_id
+                        """,
+                        (agent_ids,),
+                    )
+                    stats_rows = {row[0]: row[1:] for row in cursor.fetchall()}
+                    cursor.close()
+            except Exception as e:
+                logger.debug(f"No analytics for agents: {e}")
+
+        # Convert to AgentResponse objects
+        agents = []
+        for agent_data in agents_data:
+            agent_id = agent_data["agent_id"]
+
+            # Parse functions from ABI if available
+            functions = None
+            if agent_data.get("abi"):
+                functions = self.parse_abi_functions(
+                    agent_data["abi"], agent_id, authorizations.get(agent_id, {})
+                )
+
+            # Analytics for this agent
+            analytics = None
+            row = stats_rows.get(agent_id)
+            if row and row[0] > 0:
+                analytics = AgentStats(
+                    agent_id=agent_id,
+                    agent_name=agent_data["name"],
+                    total_calls=row[0] or 0,
+                    unique_users=row[1] or 0,
+                    total_gas_used=row[2] or 0,
+                    success_rate=float(row[3]) if row[3] else 0.0,
+                    average_gas_per_call=int(row[2] / row[0]) if row[0] > 0 else 0,
+                )
+
+            agents.append(
+                AgentResponse(
+                    id=agent_id,
+                    target_address=agent_data["target_address"],
+                    owner=agent_data["owner"],
+                    name=agent_data["name"],
+                    config_ipfs=agent_data["config_ipfs"],
+                    active=agent_data["active"],
+                    created_at=agent_data["created_at"],
+                    functions=functions,
+                    analytics=analytics,
+                )
             )
 
+        logger.info(f"Retrieved {len(agents)} agents from cache")
+        return agents
+
+    async def get_agent(self, agent_id: str) -> Optional[AgentResponse]:
+        """Get agent by ID - checks in-process cache, then database cache, then blockchain"""
+        agent = _agent_cache.get(agent_id)
+        if agent is not None:
+            return agent
+
+        try:
+            agent = await self._fetch_agent(agent_id)
         except Exception as e:
             logger.error(f"Error fetching agent {agent_id}: {e}")
-            return None
+            stale = _agent_last_known.get(agent_id)
+            if stale is not None:
+                logger.warning(f"Serving last known data for agent {agent_id}")
+            return stale
+
+        if agent is not None:
+            _agent_cache[agent_id] = agent
+            _agent_last_known[agent_id] = agent
+        return agent
+
+    async def _fetch_agent(self, agent_id: str) -> Optional[AgentResponse]:
+        """Load agent from database cache, falling back to the blockchain"""
+        # First, try to get from database cache
+        with get_db_connection() as conn:
+            agent_data = AgentCacheModel.get_by_id(conn, agent_id)
+
+            if agent_data:
+                logger.info(f"Found agent {agent_id} in database cache")
+
+                # Parse functions from ABI if available
+                functions = None
+                abi = agent_data.get("abi")
+                if abi:
+                    functions = self.parse_abi_functions(abi, agent_id)
+
+                return AgentResponse(
+                    id=agent_data["agent_id"],
+                    target_address=agent_data["target_address"],
+                    owner=agent_data["owner"],
+                    name=agent_data["name"],
+                    config_ipfs=agent_data["config_ipfs"],
+                    active=agent_data["active"],
+                    created_at=agent_data["created_at"],
+                    functions=functions,
+                    abi=abi,  # Include full ABI
+                )
+
+        # If not in cache, try blockchain
+        logger.info(f"Agent {agent_id} not in cache, querying blockchain...")
+        registry = self.client.get_contract("AgentRegistry")
+
+        # Get agent data
+        agent_data = await registry.functions.getAgent(_agent_id_to_bytes32(agent_id)).call()
+
+        # Agent struct in contract is:
+        # struct Agent { address owner; address targetContract; string name; string configIPFS; bool active; uint256 createdAt; uint256 updatedAt; }
+        owner = agent_data[0]
+        target_contract = agent_data[1]
+        name = agent_data[2]
+        config_ipfs = agent_data[3]
+        active = agent_data[4]
+        # createdAt is index 5 if returned
+        created_at = (
+            datetime.fromtimestamp(int(agent_data[5]), tz=timezone.utc)
+            if len(agent_data) > 5 and agent_data[5]
+            else None
+        )
+
+        # Parse response
+        return AgentResponse(
+            id=agent_id,
+            target_address=target_contract,
+            owner=owner,
+            name=name,
+            config_ipfs=config_ipfs,
+            active=active,
+            created_at=created_at,
+        )
 
     async def get_agent_by_name(self, name: str) -> Optional[AgentResponse]:
-        """Get agent by name (requires iteration or mapping)"""
-        try:
-            registry = self.client.get_contract("AgentRegistry")
+        """Get agent by name via the database cache's case-insensitive name index"""
+        key = name.lower()
+        agent_id = _agent_name_cache.get(key)
 
-            # Get agent by name (if contract supports it)
-            # This is a simplified version - in production, you'd want an indexed mapping
-            # For now, we'll try to find by checking events or implement a backend cache
+        if agent_id is None:
+            try:
+                with get_db_connection() as conn:
+                    agent_data = AgentCacheModel.get_by_name(conn, name)
+            except Exception as e:
+                logger.error(f"Error fetching agent by name {name}: {e}")
+                return None
 
-            logger.warning("get_agent_by_name not fully implemented - needs backend cache")
-            return None
+            if not agent_data:
+                return None
 
-        except Exception as e:
-            logger.error(f"Error fetching agent by name {name}: {e}")
-            return None
+            agent_id = agent_data["agent_id"]
+            _agent_name_cache[key] = agent_id
+
+        return await self.get_agent(agent_id)
 
     async def is_agent_active(self, agent_id: str) -> bool:
         """Check if agent is active"""
         try:
-            registry = self.client.get_contract("AgentRegistry")
-
-            if isinstance(agent_id, str) and agent_id.startswith("0x"):
-                agent_id_bytes = bytes.fromhex(agent_id[2:])
-            else:
-                agent_id_bytes = agent_id.encode().ljust(32, b"\x00")[:32]
-
-            return await registry.functions.isAgentActive(agent_id_bytes).call()
-
+            return await _get_or_load(
+                _agent_active_cache, agent_id, lambda: self._fetch_agent_active(agent_id)
+            )
         except Exception as e:
             logger.error(f"Error checking agent active status: {e}")
             return False
 
+    async def _fetch_agent_active(self, agent_id: str) -> bool:
+        """Read the agent's active flag from the registry"""
+        registry = self.client.get_contract("AgentRegistry")
+        return await registry.functions.isAgentActive(_agent_id_to_bytes32(agent_id)).call()
+
     async def validate_transaction(
         self, agent_id: str, target: str, function_selector: str, user_address: str
     ) -> bool:
@@ -254,20 +402,9 @@ class BlockchainService:
         try:
             hub = self.client.get_contract("ContractMindHubV2")
 
-            # Convert inputs
-            if isinstance(agent_id, str) and agent_id.startswith("0x"):
-                agent_id_bytes = bytes.fromhex(agent_id[2:])
-            else:
-                agent_id_bytes = agent_id.encode().ljust(32, b"\x00")[:32]
-
-            if isinstance(function_selector, str) and function_selector.startswith("0x"):
-                selector_bytes = bytes.fromhex(function_selector[2:])
-            else:
-                selector_bytes = function_selector[:4].encode()
-
             # Call validateTransaction on hub
             is_valid = await hub.functions.validateTransaction(
-                agent_id_bytes, target, selector_bytes
+                _agent_id_to_bytes32(agent_id), target, _selector_to_bytes4(function_selector)
             ).call({"from": user_address})
 
             return is_valid
@@ -276,6 +413,25 @@ class BlockchainService:
             logger.error(f"Error validating transaction: {e}")
             return False
 
+    async def multicall(self, calls: List[Tuple[str, bytes]]) -> List[Union[bytes, RPCError]]:
+        """
+        Run independent eth_calls in one JSON-RPC batch instead of a round-trip each
+
+        Args:
+            calls: (contract address, calldata) pairs
+
+        Returns:
+            Raw return data in call order (b"" when the call returned nothing); an
+            RPCError where the call failed or reverted
+        """
+        results = await self.client.batch_call(
+            [("eth_call", [{"to": to, "data": "0x" + data.hex()}, "latest"]) for to, data in calls]
+        )
+        return [
+            result if isinstance(result, RPCError) else bytes.fromhex((result or "0x")[2:])
+            for result in results
+        ]
+
     async def get_transaction_receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
         """Get transaction receipt"""
         try:
@@ -287,21 +443,43 @@ class BlockchainService:
             logger.error(f"Error getting receipt: {e}")
             return None
 
-    async def parse_transaction_events(self, tx_hash: str) -> List[TransactionEvent]:
-        """Parse events from transaction receipt"""
+    async def lookup_transaction_receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get transaction receipt, telling "not found" apart from failures
+
+        Returns None if the node has no receipt (pending or unknown); RPC errors raise
+        instead of being reported as a missing receipt.
+        """
         try:
-            receipt = await self.get_transaction_receipt(tx_hash)
-            if not receipt:
-                return []
+            receipt = await self.client.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+        return dict(receipt) if receipt else None
+
+    async def parse_transaction_events(self, tx_hash: str) -> List[TransactionEvent]:
+        """Fetch a transaction receipt and parse its events"""
+        receipt = await self.get_transaction_receipt(tx_hash)
+        if not receipt:
+            return []
+        return self.parse_events_from_receipt(receipt)
 
+    def parse_events_from_receipt(self, receipt: Dict[str, Any]) -> List[TransactionEvent]:
+        """Parse events from an already fetched transaction receipt"""
+        try:
             events = []
-            hub = self.client.get_contract("ContractMindHubV2")
 
-            # Parse FunctionExecuted events
+            # Parse FunctionExecuted events; other logs are skipped on topic0 alone
             for log in receipt.get("logs", []):
+                topics = log.get("topics")
+                if not topics or topics[0] != _FUNCTION_EXECUTED_TOPIC:
+                    continue
+
+                if self._fn_exec_event is None:
+                    hub = self.client.get_contract("ContractMindHubV2")
+                    self._fn_exec_event = hub.events.FunctionExecuted()
+
                 try:
-                    # Try to parse with hub contract
-                    event = hub.events.FunctionExecuted().process_log(log)
+                    event = self._fn_exec_event.process_log(log)
 
                     events.append(
                         TransactionEvent(
@@ -311,9 +489,9 @@ class BlockchainService:
                             transaction_hash=log["transactionHash"].hex(),
                         )
                     )
-                except:
-                    # Not a FunctionExecuted event, skip
-                    pass
+                except (MismatchedABI, LogTopicError, DecodingError, KeyError, IndexError):
+                    # Same signature from another contract/ABI that doesn't decode, skip
+                    continue
 
             return events
 
@@ -325,35 +503,64 @@ class BlockchainService:
         """
         Detect if contract is hub-aware or regular
 
+        Definitive answers are recorded in contract_types, so each address costs at most
+        one RPC call.
+
         Returns:
             "hub-aware" if contract has trustedHub
             "regular" otherwise
         """
+        key = address.lower()
+        contract_type = _contract_type_cache.get(key)
+        if contract_type:
+            return contract_type
+
         try:
-            # Try to call trustedHub() function
-            # This is a simple ABI with just the function we need
-            hub_aware_abi = [
-                {
-                    "inputs": [],
-                    "name": "trustedHub",
-                    "outputs": [{"type": "address"}],
-                    "stateMutability": "view",
-                    "type": "function",
-                }
-            ]
-
-            contract = self.client.w3.eth.contract(address=address, abi=hub_aware_abi)
+            contract_type = await run_db(ContractTypeModel.get, key)
+        except Exception as e:
+            logger.warning(f"Failed to read contract type for {address}: {e}")
+
+        if contract_type is None:
+            contract_type, definitive = await self._probe_contract_type(address)
+            if not definitive:
+                return contract_type
+            try:
+                await run_db(ContractTypeModel.insert, key, contract_type)
+            except Exception as e:
+                logger.warning(f"Failed to record contract type for {address}: {e}")
 
+        _contract_type_cache[key] = contract_type
+        return contract_type
+
+    async def _probe_contract_type(self, address: str) -> Tuple[str, bool]:
+        """
+        Ask the contract for trustedHub() on-chain
+
+        Returns (type, definitive). Only a set hub or deployed code without trustedHub is
+        definitive; a zero hub may still be configured, and an empty result from an
+        address with no code (not deployed yet, node behind) or an RPC error says nothing.
+        """
+        try:
+            contract = self.client.w3.eth.contract(address=address, abi=_TRUSTED_HUB_ABI)
             hub_address = await contract.functions.trustedHub().call()
 
             # Check if it's a valid hub address (not zero address)
             if hub_address and hub_address != "0x0000000000000000000000000000000000000000":
                 logger.info(f"Contract {address} is hub-aware (hub: {hub_address})")
-                return "hub-aware"
+                return "hub-aware", True
+            definitive = False
 
+        except (BadFunctionCallOutput, ContractLogicError) as e:
+            # No trustedHub function - or no contract at all, which only the code tells
+            logger.debug(f"Contract {address} has no trustedHub: {e}")
+            try:
+                definitive = len(await self.client.w3.eth.get_code(address)) > 0
+            except Exception as code_error:
+                logger.debug(f"Contract {address} code lookup failed: {code_error}")
+                definitive = False
         except Exception as e:
-            # Contract doesn't have trustedHub function
             logger.debug(f"Contract {address} detection failed: {e}")
+            definitive = False
 
         logger.info(f"Contract {address} is regular (not hub-aware)")
-        return "regular"
+        return "regular", definitive
@@ -8,8 +8,24 @@ from loguru import logger
 from app.config import settings
 
 
+def enqueue_default_sink():
+    """
+    Move loguru's default stderr sink onto a background worker
+
+    Keeps the default destination, level and format; only the write leaves the event
+    loop. setup_logging() is the full configuration with rotating log files.
+    """
+    logger.remove()
+    logger.add(sys.stderr, enqueue=True)
+
+
 def setup_logging():
-    """Configure logging for the application"""
+    """
+    Configure logging for the application
+
+    Sinks use enqueue=True so records are written by a background worker instead of
+    blocking the event loop on stdout/file I/O.
+    """
 
     # Remove default handler
     logger.remove()
@@ -20,6 +36,7 @@ def setup_logging():
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
         colorize=True,
+        enqueue=True,
     )
 
     # File handler
@@ -30,6 +47,7 @@ def setup_logging():
         compression="zip",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
+        enqueue=True,
     )
 
     # Error file handler
@@ -40,6 +58,7 @@ def setup_logging():
         compression="zip",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         level="ERROR",
+        enqueue=True,
     )
 
     logger.info("Logging configured")
@@ -2,10 +2,13 @@
 Tests for documentation-compatible endpoints and on-chain read flow
 """
 
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, MagicMock
+from web3 import Web3
 
+from app.blockchain.client import RPCError
 from app.main import app
 from app.models.schemas import ParsedIntent, TransactionRequest, AgentResponse
 from app.api.dependencies import (
@@ -71,6 +74,7 @@ class DummyExecutionService:
 
 class DummyBlockchainClient:
     def __init__(self):
+        self.initialized = False
         self.w3 = MagicMock()
         self.w3.eth.get_transaction_count = AsyncMock(return_value=0)
 
@@ -144,8 +148,10 @@ class DummyBlockchainClient:
         return 1
 
     async def get_transaction_receipt(self, tx_hash: str):
-        # Return a fake receipt with a single log; details are irrelevant since we mock process_log
-        return {"logs": [{}], "status": 1, "blockNumber": 100, "gasUsed": 42000}
+        # Return a fake receipt with a single AgentRegistered log; data is irrelevant since we
+        # mock process_log, but topic0 must match for the log to be decoded
+        topic = Web3.keccak(text="AgentRegistered(bytes32,address,address,string)")
+        return {"logs": [{"topics": [topic]}], "status": 1, "blockNumber": 100, "gasUsed": 42000}
 
 
 class DummyBlockchainService:
@@ -162,6 +168,9 @@ class DummyBlockchainService:
             active=True,
         )
 
+    async def get_all_agents(self, skip: int = 0, limit: int = 100, owner=None):
+        return [await self.get_agent("0x" + "aa" * 32)]
+
 
 @pytest.fixture(autouse=True)
 def _reset_dependency_overrides():
@@ -239,3 +248,152 @@ def test_agents_confirm_returns_agent_id():
     body = resp.json()
     assert body.get("success") is True
     assert body.get("agentId", "").startswith("0x11")  # from our DummyBlockchainClient
+    assert body["agent"]["name"] == "Test Agent"
+
+
+@pytest.mark.parametrize(
+    "message, action, expected",
+    [
+        ("What's my balance?", "query", "balance"),
+        ("Show pending rewards", "query", "rewards"),
+        ("What's the APY?", "query", "apy"),
+        ("current TVL please", "query", "tvl"),
+        ("get my stake info", "query", "stakeinfo"),
+        ("anything", "getcurrentapy", "apy"),
+        ("hello there", "query", None),
+    ],
+)
+def test_select_read_fn(message, action, expected):
+    from app.api.v1.chat import _select_read_fn
+
+    assert _select_read_fn(message, action) == expected
+
+
+def test_encode_address_matches_eth_abi():
+    from eth_abi import encode
+    from app.api.v1.chat import _encode_address
+
+    address = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0"
+    assert _encode_address(address) == encode(["address"], [address])
+    with pytest.raises(ValueError):
+        _encode_address("0x1234")
+
+
+def test_decode_uint256_tuple_matches_eth_abi():
+    from eth_abi import decode, encode
+    from app.api.v1.chat import _decode_uint256_tuple
+
+    values = (10**18, 0, 2**256 - 1, 1250)
+    raw = encode(["uint256"] * 4, values)
+    assert _decode_uint256_tuple(raw, 4) == decode(["uint256"] * 4, raw) == values
+    with pytest.raises(ValueError):
+        _decode_uint256_tuple(raw[:64], 4)
+
+
+@pytest.mark.parametrize(
+    "raw_result, expected",
+    [
+        (RPCError("execution reverted: paused", 3), "Error querying totalSupply"),
+        (b"", "is not deployed or not accessible"),
+    ],
+)
+def test_token_read_reports_rpc_errors(monkeypatch, raw_result, expected):
+    """A reverted call reports the node's error; only empty return data means not deployed"""
+    from contextlib import contextmanager
+    from app.api.v1 import chat as chat_module
+    from app.db import session
+    from app.db.models import AgentCacheModel
+
+    @contextmanager
+    def fake_connection():
+        yield MagicMock()
+
+    monkeypatch.setattr(session, "get_db_connection", fake_connection)
+    monkeypatch.setattr(AgentCacheModel, "get_by_id", lambda conn, agent_id: {"abi": [{}]})
+
+    blockchain = MagicMock()
+    blockchain.client.initialized = True
+    blockchain.client.w3.eth.contract.return_value.address = "0x" + "44" * 20
+    blockchain.multicall = AsyncMock(return_value=[raw_result, b"\x00" * 31 + b"\x12"])
+    agent = MagicMock(id="0x" + "aa" * 32, target_address="0x" + "44" * 20)
+
+    reply = asyncio.run(
+        chat_module._execute_read_query(blockchain, agent, "totalSupply", "0x" + "66" * 20, {})
+    )
+
+    assert expected in reply
+    if isinstance(raw_result, RPCError):
+        assert "execution reverted: paused" in reply
+
+
+def test_agents_confirm_rejects_malformed_tx_hash():
+    app.dependency_overrides[get_blockchain_service] = lambda: DummyBlockchainService()
+
+    client = TestClient(app)
+    resp = client.post("/api/v1/agents/confirm", json={"txHash": "0x1234"})
+
+    assert resp.status_code == 422
+
+
+def test_chat_read_flow_skips_intent_mapping():
+    intent_service = DummyIntentService()
+    intent_service.process_intent = AsyncMock(side_effect=AssertionError("not for reads"))
+    app.dependency_overrides[get_chat_service] = lambda: DummyChatService()
+    app.dependency_overrides[get_intent_service] = lambda: intent_service
+    app.dependency_overrides[get_execution_service] = lambda: DummyExecutionService()
+    app.dependency_overrides[get_blockchain_service] = lambda: DummyBlockchainService()
+
+    client = TestClient(app)
+    payload = {"message": "What's the APY?", "userAddress": "0x" + "66" * 20}
+    resp = client.post(f"/api/v1/chat/0x{'aa' * 32}/message", json=payload)
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["apy"] == "1250"
+    intent_service.process_intent.assert_not_called()
+
+
+def test_agents_list_revalidates_with_etag():
+    svc = DummyBlockchainService()
+    app.dependency_overrides[get_blockchain_service] = lambda: svc
+
+    client = TestClient(app)
+    first = client.get("/api/v1/agents")
+    etag = first.headers["etag"]
+    second = client.get("/api/v1/agents", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "max-age=30"
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+
+
+def test_agents_list_etag_follows_body():
+    """A changed page gets a new tag, so a stale tag never revalidates it"""
+    svc = DummyBlockchainService()
+    app.dependency_overrides[get_blockchain_service] = lambda: svc
+
+    client = TestClient(app)
+    etag = client.get("/api/v1/agents").headers["etag"]
+    load_page = svc.get_all_agents
+
+    async def renamed_page(**kwargs):
+        agents = await load_page(**kwargs)
+        agents[0].name = "Renamed"
+        return agents
+
+    svc.get_all_agents = renamed_page
+    resp = client.get("/api/v1/agents", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert resp.json()["agents"][0]["name"] == "Renamed"
+
+
+def test_agents_list_omits_null_fields():
+    app.dependency_overrides[get_blockchain_service] = lambda: DummyBlockchainService()
+
+    client = TestClient(app)
+    agent = client.get("/api/v1/agents").json()["agents"][0]
+
+    assert agent["targetContract"] == "0x" + "44" * 20
+    assert not {"createdAt", "functions", "abi", "analytics"} & agent.keys()
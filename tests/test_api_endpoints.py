@@ -2,6 +2,7 @@
 Integration tests for API endpoints
 """
 
+import json
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, MagicMock
@@ -83,3 +84,261 @@ class TestAnalyticsAPI:
         finally:
             # Clean up the override
             app.dependency_overrides.clear()
+
+
+class TestTransactionsAPI:
+    """Test transaction endpoints"""
+
+    def test_get_transaction_history(self):
+        """History rows are serialized directly, dropping empty fields"""
+        from datetime import datetime
+
+        row = {
+            "id": 1,
+            "tx_hash": "0x" + "ab" * 32,
+            "user_address": "0x" + "11" * 20,
+            "agent_id": None,
+            "target_address": "0x" + "22" * 20,
+            "function_name": "stake",
+            "execution_mode": "hub",
+            "status": "pending",
+            "block_number": None,
+            "gas_used": None,
+            "intent_action": None,
+            "intent_protocol": None,
+            "created_at": datetime(2024, 1, 1, 12, 0, 0),
+            "confirmed_at": None,
+        }
+
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.api.v1.transactions.get_async_pool", AsyncMock(return_value=pool)), patch(
+            "app.api.v1.transactions.TransactionModel.get_transactions",
+            AsyncMock(return_value=([row], 1)),
+        ):
+            client = TestClient(app)
+            response = client.get("/api/v1/transactions", params={"limit": 10})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["limit"] == 10
+        item = data["transactions"][0]
+        assert item["created_at"] == "2024-01-01T12:00:00"
+        assert "block_number" not in item
+
+    def test_export_transactions_streams_ndjson(self):
+        """Export writes one JSON object per line"""
+        from datetime import datetime
+
+        rows = [
+            {
+                "id": i,
+                "tx_hash": f"0x{i:064x}",
+                "user_address": "0x" + "11" * 20,
+                "agent_id": None,
+                "target_address": "0x" + "22" * 20,
+                "function_name": "stake",
+                "execution_mode": "hub",
+                "status": "confirmed",
+                "block_number": 100 + i,
+                "gas_used": None,
+                "intent_action": None,
+                "intent_protocol": None,
+                "created_at": datetime(2024, 1, 1, 12, 0, i),
+                "confirmed_at": None,
+            }
+            for i in (2, 1)
+        ]
+
+        async def fake_iter(conn, **filters):
+            assert filters == {"agent_id": None, "user_address": None, "status": "confirmed"}
+            for row in rows:
+                yield row
+
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.api.v1.transactions.get_async_pool", AsyncMock(return_value=pool)), patch(
+            "app.api.v1.transactions.TransactionModel.iter_transactions", fake_iter
+        ):
+            client = TestClient(app)
+            response = client.get("/api/v1/transactions/export", params={"status": "confirmed"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == [2, 1]
+        assert lines[0]["block_number"] == 102
+        assert "gas_used" not in lines[0]
+
+    def test_transaction_history_structs_match_schemas(self):
+        """msgspec Structs stay in sync with the documented Pydantic schemas"""
+        from app.models import msg
+        from app.models.schemas import TransactionHistoryItem, TransactionHistoryResponse
+
+        assert set(msg.TransactionHistoryItemMsg.__struct_fields__) == set(
+            TransactionHistoryItem.model_fields
+        )
+        assert set(msg.TransactionHistoryResponseMsg.__struct_fields__) == set(
+            TransactionHistoryResponse.model_fields
+        )
+
+    def test_transaction_history_cursor_round_trip(self):
+        """next_cursor decodes back to the last row's keyset position"""
+        from datetime import datetime
+        from app.api.v1.transactions import _decode_cursor, _encode_cursor
+
+        created_at = datetime(2024, 1, 1, 12, 0, 0, 123456)
+        assert _decode_cursor(_encode_cursor(created_at, 42)) == (created_at, 42)
+
+    def test_transaction_history_cursor_page_omits_total(self):
+        """Keyset pages skip the count, so total is left out"""
+        from datetime import datetime
+        from app.api.v1.transactions import _encode_cursor
+
+        created_at = datetime(2024, 1, 1, 12, 0, 0)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        get_transactions = AsyncMock(return_value=([], None))
+
+        with patch("app.api.v1.transactions.get_async_pool", AsyncMock(return_value=pool)), patch(
+            "app.api.v1.transactions.TransactionModel.get_transactions", get_transactions
+        ):
+            client = TestClient(app)
+            response = client.get(
+                "/api/v1/transactions", params={"cursor": _encode_cursor(created_at, 42)}
+            )
+
+        assert response.status_code == 200
+        assert "total" not in response.json()
+        assert get_transactions.await_args.kwargs["after"] == (created_at, 42)
+
+    def test_transaction_history_rejects_bad_cursor(self):
+        """Malformed cursors are a client error"""
+        client = TestClient(app)
+        response = client.get("/api/v1/transactions", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_transaction_status_fetches_receipt_once(self):
+        """Events are parsed from the receipt the handler already fetched"""
+        from app.api.dependencies import get_blockchain_service
+        from app.models.schemas import TransactionEvent
+
+        tx_hash = "0x" + "ab" * 32
+        service = MagicMock()
+        service.get_transaction_receipt = AsyncMock(
+            return_value={"status": 1, "blockNumber": 7, "gasUsed": 21000, "logs": []}
+        )
+        service.parse_transaction_events = AsyncMock(side_effect=AssertionError("refetch"))
+        service.parse_events_from_receipt.return_value = [
+            TransactionEvent(
+                name="FunctionExecuted",
+                args={"success": True},
+                log_index=0,
+                transaction_hash=tx_hash,
+            )
+        ]
+        app.dependency_overrides[get_blockchain_service] = lambda: service
+
+        try:
+            client = TestClient(app)
+            response = client.post("/api/v1/transactions/status", json={"tx_hash": tx_hash})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["events"][0]["name"] == "FunctionExecuted"
+        service.get_transaction_receipt.assert_awaited_once()
+
+    def test_transaction_status_hex_encodes_bytes_args(self):
+        """Raw bytes event args (bytes32, bytes4, bytes) come back as 0x-hex"""
+        from app.api.dependencies import get_blockchain_service
+        from app.models.schemas import TransactionEvent
+
+        tx_hash = "0x" + "ab" * 32
+        service = MagicMock()
+        service.get_transaction_receipt = AsyncMock(
+            return_value={"status": 1, "blockNumber": 7, "gasUsed": 21000, "logs": []}
+        )
+        service.parse_events_from_receipt.return_value = [
+            TransactionEvent(
+                name="FunctionExecuted",
+                args={
+                    "agentId": b"\xab" * 32,
+                    "selector": bytes.fromhex("a9059cbb"),
+                    "result": b"",
+                },
+                log_index=0,
+                transaction_hash=tx_hash,
+            )
+        ]
+        app.dependency_overrides[get_blockchain_service] = lambda: service
+
+        try:
+            client = TestClient(app)
+            response = client.post("/api/v1/transactions/status", json={"tx_hash": tx_hash})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        args = response.json()["events"][0]["args"]
+        assert args == {"agentId": "0x" + "ab" * 32, "selector": "0xa9059cbb", "result": "0x"}
+
+    def test_transaction_status_batch(self):
+        """Each hash gets its own status and one failure does not sink the batch"""
+        from app.api.dependencies import get_blockchain_service
+        from app.models.schemas import TransactionEvent
+
+        confirmed, pending, broken = ("0x" + c * 64 for c in "abc")
+        receipts = {
+            confirmed: {"status": 1, "blockNumber": 7, "gasUsed": 21000, "logs": []},
+            pending: None,
+        }
+
+        async def get_receipt(tx_hash):
+            if tx_hash == broken:
+                raise ConnectionError("rpc down")
+            return receipts[tx_hash]
+
+        service = MagicMock()
+        service.lookup_transaction_receipt = AsyncMock(side_effect=get_receipt)
+        service.parse_events_from_receipt.return_value = [
+            TransactionEvent(
+                name="FunctionExecuted",
+                args={"agentId": b"\xab" * 32, "success": True},
+                log_index=0,
+                transaction_hash=confirmed,
+            )
+        ]
+        app.dependency_overrides[get_blockchain_service] = lambda: service
+
+        try:
+            client = TestClient(app)
+            response = client.post(
+                "/api/v1/transactions/status/batch",
+                json={"tx_hashes": [confirmed, pending, broken]},
+            )
+            too_many = client.post(
+                "/api/v1/transactions/status/batch", json={"tx_hashes": [pending] * 51}
+            )
+            malformed = client.post(
+                "/api/v1/transactions/status/batch", json={"tx_hashes": [pending, "0x1234"]}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        statuses = response.json()["statuses"]
+        assert [s["status"] for s in statuses] == ["success", "pending", "error"]
+        assert statuses[0]["block_number"] == 7
+        assert statuses[0]["events"][0]["args"] == {"agentId": "0x" + "ab" * 32, "success": True}
+        assert too_many.status_code == 422
+        assert malformed.status_code == 422
@@ -0,0 +1,93 @@
+"""
+Tests for BlockchainClient's JSON-RPC batching
+"""
+
+import pytest
+
+from app.blockchain.client import MAX_RPC_BATCH_SIZE, BlockchainClient, RPCError
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self._body
+
+
+class _FakeSession:
+    """Answers each batch POST with reply(payload), recording the payloads"""
+
+    closed = False
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.payloads = []
+
+    def post(self, url, json=None, timeout=None):
+        self.payloads.append(json)
+        return _FakeResponse(self.reply(json))
+
+
+def _client(reply) -> BlockchainClient:
+    client = BlockchainClient()
+    client._session = _FakeSession(reply)
+    return client
+
+
+class TestBatchCall:
+    """Test cases for batched JSON-RPC calls"""
+
+    @pytest.mark.asyncio
+    async def test_results_map_back_to_call_order_across_chunks(self):
+        """Calls are chunked per POST and out-of-order replies land in call order"""
+
+        def reply(payload):
+            # Answer in reverse order and fail call 3
+            return [
+                (
+                    {"jsonrpc": "2.0", "id": req["id"], "error": {"code": 3, "message": "reverted"}}
+                    if req["id"] == 3
+                    else {"jsonrpc": "2.0", "id": req["id"], "result": hex(req["id"])}
+                )
+                for req in reversed(payload)
+            ]
+
+        client = _client(reply)
+        calls = [("eth_blockNumber", [])] * (MAX_RPC_BATCH_SIZE + 3)
+
+        results = await client.batch_call(calls)
+
+        assert [len(p) for p in client._session.payloads] == [MAX_RPC_BATCH_SIZE, 3]
+        assert [req["id"] for req in client._session.payloads[1]] == [10, 11, 12]
+        assert isinstance(results[3], RPCError)
+        assert str(results[3]) == "reverted" and results[3].code == 3
+        assert [r for i, r in enumerate(results) if i != 3] == [
+            hex(i) for i in range(len(calls)) if i != 3
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_reply_is_an_error(self):
+        """A call the node never answered does not come back as a result"""
+        client = _client(lambda payload: [{"jsonrpc": "2.0", "id": 0, "result": "0x1"}])
+
+        results = await client.batch_call([("eth_blockNumber", []), ("eth_chainId", [])])
+
+        assert results[0] == "0x1"
+        assert isinstance(results[1], RPCError)
+
+    @pytest.mark.asyncio
+    async def test_non_list_reply_is_rejected(self):
+        """Providers without batch support answer with one error object"""
+        client = _client(
+            lambda payload: {"jsonrpc": "2.0", "id": None, "error": {"message": "no batches"}}
+        )
+
+        with pytest.raises(ValueError, match="RPC batch request rejected"):
+            await client.batch_call([("eth_blockNumber", [])])
@@ -0,0 +1,384 @@
+"""
+Tests for BlockchainService
+"""
+
+import asyncio
+import pytest
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services import blockchain_service
+from app.services.blockchain_service import BlockchainService, invalidate_agent_cache
+from app.models.schemas import AgentResponse
+
+
+AGENT_ID = "0x" + "ab" * 32
+
+
+def _agent(name: str = "DeFi Staking") -> AgentResponse:
+    return AgentResponse(
+        id=AGENT_ID,
+        target_address="0x" + "44" * 20,
+        owner="0x" + "55" * 20,
+        name=name,
+        config_ipfs="ipfs://QmConfig",
+        active=True,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    blockchain_service._agent_cache.clear()
+    blockchain_service._agent_name_cache.clear()
+    blockchain_service._agent_last_known.clear()
+    blockchain_service._agent_list_cache.clear()
+    blockchain_service._agent_active_cache.clear()
+    blockchain_service._contract_type_cache.clear()
+    yield
+
+
+class TestAgentCache:
+    """Test cases for the agent lookup cache"""
+
+    @pytest.mark.asyncio
+    async def test_get_agent_served_from_cache(self):
+        """Repeat lookups do not hit the database or chain"""
+        service = BlockchainService()
+        service._fetch_agent = AsyncMock(return_value=_agent())
+
+        first = await service.get_agent(AGENT_ID)
+        second = await service.get_agent(AGENT_ID)
+
+        assert first is second
+        service._fetch_agent.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_agent_refetches_after_invalidation(self):
+        """Invalidation forces the next lookup to reload the agent"""
+        service = BlockchainService()
+        service._fetch_agent = AsyncMock(side_effect=[_agent(), _agent("Renamed")])
+
+        await service.get_agent(AGENT_ID)
+        invalidate_agent_cache(AGENT_ID)
+        agent = await service.get_agent(AGENT_ID)
+
+        assert agent.name == "Renamed"
+        assert service._fetch_agent.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_agent_serves_last_known_on_error(self):
+        """An expired entry is still returned when the reload fails"""
+        service = BlockchainService()
+        service._fetch_agent = AsyncMock(side_effect=[_agent(), ConnectionError("rpc down")])
+
+        await service.get_agent(AGENT_ID)
+        blockchain_service._agent_cache.clear()  # simulate TTL expiry
+        agent = await service.get_agent(AGENT_ID)
+
+        assert agent is not None
+        assert agent.name == "DeFi Staking"
+
+    @pytest.mark.asyncio
+    async def test_chain_fallback_parses_created_at_as_utc(self):
+        """Agents read from the registry get a timezone-aware createdAt"""
+        from datetime import datetime, timezone
+
+        @contextmanager
+        def fake_connection():
+            yield MagicMock()
+
+        registry = MagicMock()
+        registry.functions.getAgent.return_value.call = AsyncMock(
+            return_value=(
+                "0x" + "55" * 20,
+                "0x" + "44" * 20,
+                "Chain",
+                "ipfs://Qm",
+                True,
+                1700000000,
+                0,
+            )
+        )
+        service = BlockchainService()
+        service.client = MagicMock()
+        service.client.get_contract.return_value = registry
+
+        with patch.object(blockchain_service, "get_db_connection", fake_connection), patch.object(
+            blockchain_service.AgentCacheModel, "get_by_id", return_value=None
+        ):
+            agent = await service._fetch_agent(AGENT_ID)
+
+        assert agent.created_at == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+
+class TestGetAllAgents:
+    """Test cases for listing agents from the database cache"""
+
+    @pytest.mark.asyncio
+    async def test_page_loads_analytics_in_one_query(self):
+        """Analytics for every agent on the page come from a single grouped query"""
+        rows = [
+            {
+                "agent_id": f"0x{i:064x}",
+                "target_address": "0x" + "44" * 20,
+                "owner": "0x" + "55" * 20,
+                "name": f"Agent {i}",
+                "config_ipfs": "ipfs://QmConfig",
+                "active": True,
+                "created_at": None,
+                "abi": None,
+            }
+            for i in range(3)
+        ]
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = [(rows[0]["agent_id"], 4, 2, 400, 0.5)]
+
+        @contextmanager
+        def fake_connection():
+            yield conn
+
+        with patch.object(blockchain_service, "get_db_connection", fake_connection), patch.object(
+            blockchain_service.AgentCacheModel, "get_all_active", return_value=rows
+        ), patch.object(
+            blockchain_service.AgentFunctionAuthorizationModel,
+            "get_authorizations_for_agents",
+            return_value={},
+        ):
+            agents = await BlockchainService().get_all_agents()
+
+        assert len(agents) == 3
+        assert cursor.execute.call_count == 1
+        assert agents[0].analytics.total_calls == 4
+        assert agents[0].analytics.average_gas_per_call == 100
+        assert agents[1].analytics is None
+
+    @pytest.mark.asyncio
+    async def test_page_cached_until_invalidated(self):
+        """Repeat list calls are served from cache until an agent changes"""
+        service = BlockchainService()
+        service._fetch_all_agents = AsyncMock(return_value=[_agent()])
+
+        await service.get_all_agents()
+        await service.get_all_agents()
+        invalidate_agent_cache(AGENT_ID)
+        await service.get_all_agents()
+
+        assert service._fetch_all_agents.await_count == 2
+
+
+class TestIsAgentActive:
+    """Test cases for the cached on-chain active check"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        """Concurrent checks for the same agent make a single RPC call"""
+        service = BlockchainService()
+
+        async def slow_active(agent_id):
+            await asyncio.sleep(0.01)
+            return True
+
+        service._fetch_agent_active = AsyncMock(side_effect=slow_active)
+
+        results = await asyncio.gather(*(service.is_agent_active(AGENT_ID) for _ in range(5)))
+
+        assert results == [True] * 5
+        service._fetch_agent_active.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """A failed check returns False and is retried on the next call"""
+        service = BlockchainService()
+        service._fetch_agent_active = AsyncMock(side_effect=[ConnectionError("rpc down"), True])
+
+        assert await service.is_agent_active(AGENT_ID) is False
+        assert await service.is_agent_active(AGENT_ID) is True
+
+
+class TestParseTransactionEvents:
+    """Test cases for receipt event parsing"""
+
+    @pytest.mark.asyncio
+    async def test_only_function_executed_logs_are_decoded(self):
+        """Logs with another topic0 never reach the ABI decoder"""
+        topic = blockchain_service._FUNCTION_EXECUTED_TOPIC
+        tx_hash = bytes.fromhex("cd" * 32)
+        receipt = {
+            "logs": [
+                {"topics": [b"\x00" * 32], "logIndex": 0, "transactionHash": tx_hash},
+                {"topics": [], "logIndex": 1, "transactionHash": tx_hash},
+                {"topics": [topic], "logIndex": 2, "transactionHash": tx_hash},
+            ]
+        }
+        event = MagicMock()
+        event.process_log.return_value = {"args": {"success": True}}
+
+        service = BlockchainService()
+        service._fn_exec_event = event
+        service.get_transaction_receipt = AsyncMock(return_value=receipt)
+
+        events = await service.parse_transaction_events("0x" + "cd" * 32)
+
+        assert [e.log_index for e in events] == [2]
+        assert events[0].args == {"success": True}
+        event.process_log.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_undecodable_matching_log_is_skipped(self):
+        """A log with the right topic but another ABI is dropped, not fatal"""
+        from web3.exceptions import MismatchedABI
+
+        topic = blockchain_service._FUNCTION_EXECUTED_TOPIC
+        tx_hash = bytes.fromhex("cd" * 32)
+        receipt = {
+            "logs": [
+                {"topics": [topic], "logIndex": 0, "transactionHash": tx_hash},
+                {"topics": [topic], "logIndex": 1, "transactionHash": tx_hash},
+            ]
+        }
+        event = MagicMock()
+        event.process_log.side_effect = [MismatchedABI("other abi"), {"args": {"success": True}}]
+
+        service = BlockchainService()
+        service._fn_exec_event = event
+
+        events = service.parse_events_from_receipt(receipt)
+
+        assert [e.log_index for e in events] == [1]
+
+
+class TestLookupTransactionReceipt:
+    """Test cases for receipt lookups that surface RPC errors"""
+
+    @pytest.mark.asyncio
+    async def test_missing_receipt_is_none(self):
+        """A receipt the node doesn't have yet is reported as None"""
+        from web3.exceptions import TransactionNotFound
+
+        service = BlockchainService()
+        service.client = MagicMock()
+        service.client.w3.eth.get_transaction_receipt = AsyncMock(
+            side_effect=TransactionNotFound("not found")
+        )
+
+        assert await service.lookup_transaction_receipt("0x" + "cd" * 32) is None
+
+    @pytest.mark.asyncio
+    async def test_rpc_error_raises(self):
+        """RPC failures propagate instead of looking like a pending transaction"""
+        service = BlockchainService()
+        service.client = MagicMock()
+        service.client.w3.eth.get_transaction_receipt = AsyncMock(
+            side_effect=ConnectionError("rpc down")
+        )
+
+        with pytest.raises(ConnectionError):
+            await service.lookup_transaction_receipt("0x" + "cd" * 32)
+
+
+class TestIdConversion:
+    """Test cases for the memoized on-chain id conversions"""
+
+    def test_agent_id_to_bytes32(self):
+        """Hex ids decode and plain names are zero-padded"""
+        assert blockchain_service._agent_id_to_bytes32(AGENT_ID) == bytes.fromhex("ab" * 32)
+        assert blockchain_service._agent_id_to_bytes32("staking") == b"staking".ljust(32, b"\x00")
+
+    def test_selector_to_bytes4(self):
+        """Selectors may be 0x-hex or raw strings"""
+        assert blockchain_service._selector_to_bytes4("0xa9059cbb") == bytes.fromhex("a9059cbb")
+        assert blockchain_service._selector_to_bytes4("stake()") == b"stak"
+
+
+class TestMulticall:
+    """Test cases for batched eth_call reads"""
+
+    @pytest.mark.asyncio
+    async def test_calls_share_one_batch(self):
+        """All calls go out in one batch and failed calls keep their RPC error"""
+        from app.blockchain.client import RPCError
+
+        token = "0x" + "44" * 20
+        reverted = RPCError("execution reverted", 3)
+        service = BlockchainService()
+        service.client = MagicMock()
+        service.client.batch_call = AsyncMock(
+            return_value=["0x" + "00" * 31 + "12", reverted, "0x"]
+        )
+
+        results = await service.multicall(
+            [(token, bytes.fromhex("313ce567")), (token, b"\x01"), (token, b"\x02")]
+        )
+
+        assert results == [b"\x00" * 31 + b"\x12", reverted, b""]
+        (calls,) = service.client.batch_call.await_args.args
+        assert calls[0] == ("eth_call", [{"to": token, "data": "0x313ce567"}, "latest"])
+
+
+class TestDetectContractType:
+    """Test cases for the persisted contract type lookup"""
+
+    @pytest.mark.asyncio
+    async def test_recorded_type_skips_rpc(self):
+        """A type already in contract_types is returned without probing the chain"""
+        service = BlockchainService()
+        service._probe_contract_type = AsyncMock(side_effect=AssertionError("rpc"))
+
+        with patch.object(blockchain_service, "run_db", AsyncMock(return_value="hub-aware")):
+            assert await service.detect_contract_type("0x" + "AA" * 20) == "hub-aware"
+
+    @pytest.mark.asyncio
+    async def test_definitive_probe_is_recorded_once(self):
+        """A new address is probed once, recorded, then served from memory"""
+        address = "0x" + "AA" * 20
+        service = BlockchainService()
+        service._probe_contract_type = AsyncMock(return_value=("hub-aware", True))
+        run_db = AsyncMock(side_effect=[None, None])
+
+        with patch.object(blockchain_service, "run_db", run_db):
+            assert await service.detect_contract_type(address) == "hub-aware"
+            assert await service.detect_contract_type(address) == "hub-aware"
+
+        service._probe_contract_type.assert_awaited_once()
+        assert run_db.await_args_list[1].args == (
+            blockchain_service.ContractTypeModel.insert,
+            address.lower(),
+            "hub-aware",
+        )
+
+    @pytest.mark.asyncio
+    async def test_inconclusive_probe_is_not_recorded(self):
+        """RPC failures fall back to regular without persisting it"""
+        service = BlockchainService()
+        service._probe_contract_type = AsyncMock(return_value=("regular", False))
+        run_db = AsyncMock(return_value=None)
+
+        with patch.object(blockchain_service, "run_db", run_db):
+            assert await service.detect_contract_type("0x" + "AA" * 20) == "regular"
+            assert await service.detect_contract_type("0x" + "AA" * 20) == "regular"
+
+        assert service._probe_contract_type.await_count == 2
+        assert all(
+            call.args[0] is blockchain_service.ContractTypeModel.get
+            for call in run_db.await_args_list
+        )
+
+    @pytest.mark.asyncio
+    async def test_missing_trusted_hub_is_definitive_only_with_code(self):
+        """An empty trustedHub() result only counts when the address has code"""
+        from web3.exceptions import BadFunctionCallOutput
+
+        service = BlockchainService()
+        service.client = MagicMock()
+        contract = service.client.w3.eth.contract.return_value
+        contract.functions.trustedHub.return_value.call = AsyncMock(
+            side_effect=BadFunctionCallOutput("empty")
+        )
+        service.client.w3.eth.get_code = AsyncMock(side_effect=[b"\x60\x80", b""])
+
+        deployed = await service._probe_contract_type("0x" + "AA" * 20)
+        no_code = await service._probe_contract_type("0x" + "BB" * 20)
+
+        assert deployed == ("regular", True)
+        assert no_code == ("regular", False)
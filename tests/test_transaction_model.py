@@ -0,0 +1,88 @@
+"""
+Tests for TransactionModel's asyncpg queries
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from app.db import models
+from app.db.models import TransactionModel
+
+
+def _row(tx_id: int, total_count: int) -> dict:
+    return {
+        "id": tx_id,
+        "tx_hash": f"0x{tx_id:064x}",
+        "created_at": datetime(2024, 1, 1, 12, 0, tx_id),
+        "total_count": total_count,
+    }
+
+
+def _conn(rows=(), count: int = 0) -> MagicMock:
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=list(rows))
+    conn.fetchval = AsyncMock(return_value=count)
+    return conn
+
+
+class TestGetTransactions:
+    """Test cases for the paginated transaction history query"""
+
+    @pytest.mark.asyncio
+    async def test_total_comes_from_window_count(self):
+        """The page and its total come back from one query, without total_count"""
+        conn = _conn([_row(2, 7), _row(1, 7)])
+
+        transactions, total = await TransactionModel.get_transactions(
+            conn, agent_id="0xagent", status="confirmed", limit=2, offset=4
+        )
+
+        assert total == 7
+        assert [tx["id"] for tx in transactions] == [2, 1]
+        assert all("total_count" not in tx for tx in transactions)
+        conn.fetch.assert_awaited_once_with(
+            models.TRANSACTIONS_PAGE_SQL, "0xagent", None, "confirmed", 2, 4
+        )
+        conn.fetchval.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_offset_past_end_falls_back_to_count(self):
+        """An empty page past the end still reports the total matching rows"""
+        conn = _conn(count=3)
+
+        transactions, total = await TransactionModel.get_transactions(
+            conn, user_address="0xuser", limit=10, offset=50
+        )
+
+        assert (transactions, total) == ([], 3)
+        conn.fetchval.assert_awaited_once_with(models.TRANSACTIONS_COUNT_SQL, None, "0xuser", None)
+
+    @pytest.mark.asyncio
+    async def test_empty_first_page_has_zero_total(self):
+        """No rows at offset 0 means nothing matches, so no count query is needed"""
+        conn = _conn()
+
+        transactions, total = await TransactionModel.get_transactions(conn)
+
+        assert (transactions, total) == ([], 0)
+        conn.fetch.assert_awaited_once_with(models.TRANSACTIONS_PAGE_SQL, None, None, None, 50, 0)
+        conn.fetchval.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_uses_keyset_query_without_total(self):
+        """A cursor page runs the keyset statement with the cursor after the filters"""
+        created_at = datetime(2024, 1, 1, 12, 0, 3)
+        row = _row(2, 0)
+        del row["total_count"]
+        conn = _conn([row])
+
+        transactions, total = await TransactionModel.get_transactions(
+            conn, agent_id="0xagent", limit=25, offset=100, after=(created_at, 3)
+        )
+
+        assert (transactions, total) == ([row], None)
+        conn.fetch.assert_awaited_once_with(
+            models.TRANSACTIONS_KEYSET_SQL, "0xagent", None, None, created_at, 3, 25
+        )
+        conn.fetchval.assert_not_awaited()